@@ -2,16 +2,40 @@ import argparse
 import json
 import math
 import sys
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import rasterio
+import shapely
 from rasterio import features
 from pyproj import Transformer
-from shapely.geometry import shape, mapping
-from shapely.ops import unary_union
+from shapely.geometry import Polygon, shape, mapping
 from scipy import ndimage
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Records within the same TILE_BUCKET_DEG cell share one DEM read, as long as
+# the covering window stays under MAX_TILE_PIXELS
+TILE_BUCKET_DEG = 0.01
+MAX_TILE_PIXELS = 16_000_000
+
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def dump_jsonl(obj: Dict[str, Any]) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE).decode()
+else:
+    json_loads = json.loads
+
+    def dump_jsonl(obj: Dict[str, Any]) -> str:
+        return json.dumps(obj) + "\n"
+
 
 def deg_window_from_radius(lat: float, radius_m: float) -> Tuple[float, float]:
     """Approximate conversion from meters to degrees at given latitude."""
@@ -21,65 +45,117 @@ def deg_window_from_radius(lat: float, radius_m: float) -> Tuple[float, float]:
 
 
 def iter_jsonl(f) -> Iterable[Dict[str, Any]]:
+    """Iterate JSONL records from a text or binary stream (binary skips decoding)."""
     for line in f:
         line = line.strip()
         if not line:
             continue
-        yield json.loads(line)
+        yield json_loads(line)
+
+
+@lru_cache(maxsize=256)
+def get_equal_area_transformer(lat: float, lon: float) -> Transformer:
+    """
+    Transformer from WGS84 to a Lambert azimuthal equal-area projection
+    centered on (lat, lon). Callers round the center so nearby peaks share
+    one cached PROJ setup.
+    """
+    return Transformer.from_crs(
+        "EPSG:4326", f"+proj=laea +lat_0={lat} +lon_0={lon} +datum=WGS84 +units=m", always_xy=True
+    )
 
 
-def compute_area_sq_m(geom, centroid_lat: float) -> float:
+def compute_area_sq_m(geom, lat: float, lon: float) -> float:
     """
-    Approximate area in square meters for a geometry in EPSG:4326.
-    Uses a local UTM-like projection centered on the geometry.
+    Area in square meters for a (Multi)Polygon in EPSG:4326.
+    Projects every ring into a local equal-area projection centered near
+    (lat, lon) and applies the shoelace formula to the projected coordinates.
     """
-    # Simple approximation: convert to meters using latitude
-    # More accurate would be to use pyproj to transform to a local projection
-    # but for small summit zones this is good enough
     if geom.is_empty:
         return 0.0
     
-    # Use approximate meters per degree at the centroid latitude
-    m_per_deg_lat = 111320.0
-    m_per_deg_lon = 111320.0 * math.cos(math.radians(centroid_lat))
+    # Rings come back as [exterior, holes..., exterior, holes...] per part
+    parts = shapely.get_parts(geom)
+    rings = shapely.get_rings(parts)
+    rings_per_part = shapely.get_num_interior_rings(parts) + 1
+    is_exterior = np.zeros(len(rings), dtype=bool)
+    is_exterior[np.cumsum(rings_per_part) - rings_per_part] = True
     
-    # Scale factor for area (lat * lon)
-    area_scale = m_per_deg_lat * m_per_deg_lon
+    coords, ring_idx = shapely.get_coordinates(rings, return_index=True)
+    laea = get_equal_area_transformer(round(lat, 2), round(lon, 2))
+    xs, ys = laea.transform(coords[:, 0], coords[:, 1])
     
-    return geom.area * area_scale
+    # Shoelace per ring over consecutive vertex pairs (rings are closed)
+    cross = xs[:-1] * ys[1:] - xs[1:] * ys[:-1]
+    same_ring = ring_idx[:-1] == ring_idx[1:]
+    ring_areas = 0.5 * np.abs(
+        np.bincount(ring_idx[:-1][same_ring], weights=cross[same_ring], minlength=len(rings))
+    )
+    return float(ring_areas[is_exterior].sum() - ring_areas[~is_exterior].sum())
 
 
 def count_vertices(geom) -> int:
-    """Count total vertices in a geometry."""
-    if geom.is_empty:
-        return 0
-    if hasattr(geom, 'exterior'):
-        # Polygon
-        count = len(geom.exterior.coords)
-        for interior in geom.interiors:
-            count += len(interior.coords)
-        return count
-    elif hasattr(geom, 'geoms'):
-        # Multi* geometry
-        return sum(count_vertices(g) for g in geom.geoms)
-    elif hasattr(geom, 'coords'):
-        # LineString, Point
-        return len(geom.coords)
-    return 0
+    """Count total vertices in a geometry (all rings and parts, one GEOS call)."""
+    return int(shapely.get_num_coordinates(geom))
 
 
-def extract_summit_zone(
+def reproject_geometry(geom, transformer: Transformer):
+    """
+    Reproject a geometry with a single vectorized Transformer call.
+
+    All vertices (exterior, interiors, and every part of a Multi* geometry)
+    are passed to pyproj as one coordinate array instead of one call per vertex.
+    """
+    def _transform_coords(coords: np.ndarray) -> np.ndarray:
+        xs, ys = transformer.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack([xs, ys])
+
+    return shapely.transform(geom, _transform_coords)
+
+
+# Reusable uint8 zone-mask buffers, keyed on window shape (fixed radius and
+# resolution give the same shape for most records)
+ZONE_MASK_BUFFER_LIMIT = 8
+_zone_mask_buffers: Dict[Tuple[int, ...], np.ndarray] = {}
+
+
+def zone_mask_buffer(shape: Tuple[int, ...]) -> np.ndarray:
+    """Return a scratch uint8 array of `shape`, reused across records."""
+    buf = _zone_mask_buffers.get(shape)
+    if buf is None:
+        if len(_zone_mask_buffers) >= ZONE_MASK_BUFFER_LIMIT:
+            _zone_mask_buffers.clear()
+        buf = _zone_mask_buffers[shape] = np.empty(shape, dtype=np.uint8)
+    return buf
+
+
+def union_polygons(polygons: List[Any]):
+    """
+    Union polygonize output in one GEOS call.
+    
+    Polygonized pixel regions share edges but never overlap, so the fast
+    coverage union applies; fall back to a general union if it fails.
+    """
+    geoms = np.asarray(polygons, dtype=object)
+    try:
+        merged = shapely.coverage_union_all(geoms)
+        if merged.is_valid:
+            return merged
+    except shapely.errors.GEOSException:
+        pass
+    return shapely.unary_union(geoms)
+
+
+def summit_zone_window(
     ds: rasterio.io.DatasetReader,
     lon: float,
     lat: float,
     radius_m: float,
-    threshold_m: float,
-    to_wgs84: Optional[Transformer],
     from_wgs84: Optional[Transformer],
-) -> Optional[Dict[str, Any]]:
+) -> Optional[rasterio.windows.Window]:
     """
-    Extract a polygon representing all DEM cells within threshold_m vertical meters
-    of the maximum elevation within radius_m of (lat, lon).
+    Pixel window covering radius_m around (lat, lon), clipped to the dataset.
+    Returns None when the window is empty.
     """
     if ds.crs is None:
         raise RuntimeError("DEM dataset has no CRS")
@@ -113,58 +189,139 @@ def extract_summit_zone(
     if row1 <= row0 or col1 <= col0:
         return None
 
-    window = rasterio.windows.Window.from_slices((row0, row1 + 1), (col0, col1 + 1))
-    arr = ds.read(1, window=window, masked=True)
+    return rasterio.windows.Window.from_slices((row0, row1 + 1), (col0, col1 + 1))
+
+
+def read_tile(
+    ds: rasterio.io.DatasetReader,
+    windows: List[rasterio.windows.Window],
+) -> Optional[Tuple[rasterio.windows.Window, np.ma.MaskedArray]]:
+    """
+    Read one window covering all of `windows` so their records can be sliced
+    from memory. Returns None when sharing a read is not worthwhile (a single
+    window, or a union larger than MAX_TILE_PIXELS).
+    """
+    if len(windows) < 2:
+        return None
+    tile_window = rasterio.windows.union(windows)
+    if tile_window.width * tile_window.height > MAX_TILE_PIXELS:
+        return None
+    return tile_window, ds.read(1, window=tile_window, masked=True, out_dtype=np.float32)
+
+
+def read_zone_window(
+    ds: rasterio.io.DatasetReader,
+    window: rasterio.windows.Window,
+    tile: Optional[Tuple[rasterio.windows.Window, np.ma.MaskedArray]] = None,
+) -> np.ma.MaskedArray:
+    """Slice `window` out of a pre-read tile when it fits, else read it from the DEM."""
+    if tile is not None:
+        tile_window, tile_arr = tile
+        r = window.row_off - tile_window.row_off
+        c = window.col_off - tile_window.col_off
+        if (
+            r >= 0 and c >= 0
+            and r + window.height <= tile_window.height
+            and c + window.width <= tile_window.width
+        ):
+            return tile_arr[r:r + window.height, c:c + window.width]
+    # Single precision is plenty for elevations and halves the bytes every
+    # reduction below has to touch
+    return ds.read(1, window=window, masked=True, out_dtype=np.float32)
+
+
+def extract_summit_zone(
+    ds: rasterio.io.DatasetReader,
+    lon: float,
+    lat: float,
+    radius_m: float,
+    threshold_m: float,
+    to_wgs84: Optional[Transformer],
+    from_wgs84: Optional[Transformer],
+    tile: Optional[Tuple[rasterio.windows.Window, np.ma.MaskedArray]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Extract a polygon representing all DEM cells within threshold_m vertical meters
+    of the maximum elevation within radius_m of (lat, lon).
+    
+    If `tile` (from read_tile) covers the search window, the DEM data is
+    sliced from it instead of being read again.
+    """
+    window = summit_zone_window(ds, lon, lat, radius_m, from_wgs84)
+    if window is None:
+        return None
+    row0, col0 = window.row_off, window.col_off
+
+    arr = read_zone_window(ds, window, tile)
     
     if arr.size == 0:
         return None
 
-    if np.ma.is_masked(arr):
-        if arr.mask.all():
-            return None
+    # Fetch the nodata mask once and reuse it below
+    mask = np.ma.getmaskarray(arr)
+    if mask.all():
+        return None
 
-    # Find max elevation and its location
-    max_elev = float(arr.max())
-    flat_idx = int(arr.argmax())
+    # Find max elevation and its location on the plain array (nodata cells
+    # are set to -inf so they can never win)
+    elevs = np.where(mask, -np.inf, arr.data)
+    flat_idx = int(elevs.argmax())
     max_row, max_col = np.unravel_index(flat_idx, arr.shape)
+    max_elev = float(elevs[max_row, max_col])
     
     # Create binary mask: cells >= (max_elev - threshold_m)
     threshold_elev = max_elev - threshold_m
-    zone_mask = (arr >= threshold_elev).astype(np.uint8)
+    zone_mask = np.greater_equal(arr.data, threshold_elev, out=zone_mask_buffer(arr.shape))
     
-    # Handle masked arrays
-    if np.ma.is_masked(arr):
-        zone_mask = np.where(arr.mask, 0, zone_mask)
+    # Clear nodata cells in place
+    np.copyto(zone_mask, 0, where=mask)
     
     # Find connected components and keep only the one containing the summit
     labeled_array, num_features = ndimage.label(zone_mask)
+    summit_label = labeled_array[max_row, max_col]
+    
+    # The summit cell itself can fall outside the zone (negative threshold,
+    # NaN maximum), leaving no component to keep
+    if summit_label == 0:
+        return None
+    
+    # Crop to the summit component's bounding box so polygonize only scans
+    # the cells that can contribute to the zone
+    row_slice, col_slice = ndimage.find_objects(labeled_array, max_label=summit_label)[summit_label - 1]
     if num_features > 1:
-        # Find which label contains the max elevation cell
-        summit_label = labeled_array[max_row, max_col]
         # Keep only that component
-        zone_mask = (labeled_array == summit_label).astype(np.uint8)
+        zone_mask = (labeled_array[row_slice, col_slice] == summit_label).astype(np.uint8)
+    else:
+        zone_mask = zone_mask[row_slice, col_slice]
     
-    # Get the transform for this window
-    window_transform = ds.window_transform(window)
+    # Get the transform for the cropped window
+    zone_window = rasterio.windows.Window(
+        col0 + col_slice.start,
+        row0 + row_slice.start,
+        col_slice.stop - col_slice.start,
+        row_slice.stop - row_slice.start,
+    )
+    window_transform = ds.window_transform(zone_window)
     
     # Convert mask to polygon(s)
-    shapes_gen = features.shapes(zone_mask, mask=(zone_mask == 1), transform=window_transform)
-    
-    polygons = []
-    for geom_dict, value in shapes_gen:
-        if value == 1:
-            geom = shape(geom_dict)
-            
-            # Transform to WGS84 if needed
-            if not ds.crs.is_geographic and to_wgs84 is not None:
-                # Transform polygon coordinates
-                from shapely.ops import transform as shapely_transform
-                geom = shapely_transform(
-                    lambda x, y: to_wgs84.transform(x, y),
-                    geom
-                )
-            
-            polygons.append(geom)
+    if zone_mask.all():
+        # The component fills its bounding box (always true for 1-2 cell
+        # zones), so the zone is exactly that rectangle; skip polygonize and
+        # build the ring GDAL would emit (top-left, counter-clockwise)
+        height, width = zone_mask.shape
+        polygons = [Polygon([
+            window_transform * (0, 0),
+            window_transform * (0, height),
+            window_transform * (width, height),
+            window_transform * (width, 0),
+        ])]
+    else:
+        shapes_gen = features.shapes(zone_mask, mask=zone_mask.view(bool), transform=window_transform)
+        polygons = [shape(geom_dict) for geom_dict, value in shapes_gen if value == 1]
+    
+    # Transform to WGS84 if needed
+    if not ds.crs.is_geographic and to_wgs84 is not None:
+        polygons = [reproject_geometry(geom, to_wgs84) for geom in polygons]
     
     if not polygons:
         return None
@@ -173,11 +330,10 @@ def extract_summit_zone(
     if len(polygons) == 1:
         zone_geom = polygons[0]
     else:
-        zone_geom = unary_union(polygons)
+        zone_geom = union_polygons(polygons)
     
     # Calculate area and vertex count
-    centroid = zone_geom.centroid
-    area_sq_m = compute_area_sq_m(zone_geom, centroid.y)
+    area_sq_m = compute_area_sq_m(zone_geom, lat, lon)
     vertices = count_vertices(zone_geom)
     
     # Convert to WKT
@@ -214,27 +370,61 @@ def main() -> int:
             to_wgs84 = Transformer.from_crs(ds.crs, "EPSG:4326", always_xy=True)
             from_wgs84 = Transformer.from_crs("EPSG:4326", ds.crs, always_xy=True)
 
-        for rec in iter_jsonl(sys.stdin):
+        records = list(iter_jsonl(sys.stdin.buffer))
+        outputs: List[str] = [""] * len(records)
+
+        # Resolve every record's window up front and bucket nearby records
+        buckets: Dict[Tuple[int, int], List[Tuple[int, Dict[str, float], rasterio.windows.Window]]] = {}
+        for i, rec in enumerate(records):
             try:
-                peak_id = rec.get("peak_id")
-                lat = float(rec["lat"])
-                lon = float(rec["lon"])
-                radius_m = float(rec.get("radius_m", args.default_radius_m))
-                threshold_m = float(rec.get("threshold_m", args.default_threshold_m))
-
-                result = extract_summit_zone(
-                    ds, lon=lon, lat=lat, radius_m=radius_m, threshold_m=threshold_m,
-                    to_wgs84=to_wgs84, from_wgs84=from_wgs84
-                )
-                
-                if result is None:
-                    sys.stdout.write(json.dumps({"peak_id": peak_id, "error": "no_data"}) + "\n")
-                    continue
-
-                result["peak_id"] = peak_id
-                sys.stdout.write(json.dumps(result) + "\n")
+                params = {
+                    "lat": float(rec["lat"]),
+                    "lon": float(rec["lon"]),
+                    "radius_m": float(rec.get("radius_m", args.default_radius_m)),
+                    "threshold_m": float(rec.get("threshold_m", args.default_threshold_m)),
+                }
+                window = summit_zone_window(ds, params["lon"], params["lat"], params["radius_m"], from_wgs84)
             except Exception as e:
-                sys.stdout.write(json.dumps({"peak_id": rec.get("peak_id"), "error": str(e)}) + "\n")
+                outputs[i] = dump_jsonl({"peak_id": rec.get("peak_id"), "error": str(e)})
+                continue
+
+            if window is None:
+                outputs[i] = dump_jsonl({"peak_id": rec.get("peak_id"), "error": "no_data"})
+                continue
+
+            key = (
+                math.floor(params["lat"] / TILE_BUCKET_DEG),
+                math.floor(params["lon"] / TILE_BUCKET_DEG),
+            )
+            buckets.setdefault(key, []).append((i, params, window))
+
+        for members in buckets.values():
+            try:
+                tile = read_tile(ds, [window for _, _, window in members])
+            except Exception:
+                tile = None
+
+            for i, params, _ in members:
+                rec = records[i]
+                try:
+                    peak_id = rec.get("peak_id")
+                    result = extract_summit_zone(
+                        ds, lon=params["lon"], lat=params["lat"],
+                        radius_m=params["radius_m"], threshold_m=params["threshold_m"],
+                        to_wgs84=to_wgs84, from_wgs84=from_wgs84, tile=tile,
+                    )
+
+                    if result is None:
+                        outputs[i] = dump_jsonl({"peak_id": peak_id, "error": "no_data"})
+                        continue
+
+                    result["peak_id"] = peak_id
+                    outputs[i] = dump_jsonl(result)
+                except Exception as e:
+                    outputs[i] = dump_jsonl({"peak_id": rec.get("peak_id"), "error": str(e)})
+
+        # Emit in input order
+        sys.stdout.writelines(outputs)
 
     return 0
 
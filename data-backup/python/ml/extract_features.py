@@ -12,11 +12,16 @@ Features extracted:
 - dist_to_seed: Distance from original coordinates (if provided)
 """
 
+import atexit
 import math
+import operator
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
 import rasterio
 from rasterio.windows import from_bounds
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 from pyproj import Transformer
 
 
@@ -30,6 +35,120 @@ def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return 2 * R * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 
+def haversine_m_vec(lat0: float, lon0: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Distances in meters from one point to arrays of points (as haversine_m)."""
+    R = 6371000
+    phi1 = math.radians(lat0)
+    phi2 = np.radians(lats)
+    dphi = np.radians(lats - lat0)
+    dlam = np.radians(lons - lon0)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+    return 2 * R * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+@lru_cache(maxsize=32)
+def get_native_transformers(crs_wkt: str) -> Tuple[Transformer, Transformer]:
+    """
+    Return cached (to_native, from_native) Transformers for a DEM CRS.
+    
+    Transformer construction goes through the PROJ database, so build each
+    pair once per CRS instead of once per extracted point.
+    """
+    to_native = Transformer.from_crs("EPSG:4326", crs_wkt, always_xy=True)
+    from_native = Transformer.from_crs(crs_wkt, "EPSG:4326", always_xy=True)
+    return to_native, from_native
+
+
+_dem_transformers: Dict[str, Tuple[Any, Any]] = {}
+
+
+def dem_transformers(ds) -> Tuple[Any, Any]:
+    """
+    Return (to_native, from_native) for a DEM, or (None, None) if geographic.
+    
+    Kept per dataset name, so per-peak callers skip exporting the CRS to WKT
+    for the get_native_transformers lookup.
+    """
+    transformers = _dem_transformers.get(ds.name)
+    if transformers is None:
+        if ds.crs and not ds.crs.is_geographic:
+            transformers = get_native_transformers(ds.crs.to_wkt())
+        else:
+            transformers = (None, None)
+        _dem_transformers[ds.name] = transformers
+    return transformers
+
+
+_dem_cache: Dict[str, Any] = {}
+
+
+def open_dem(dem_path: str):
+    """
+    Return this process's open dataset for a DEM path, opening it on first use.
+    
+    Opening a VRT parses its XML and its source files, so each process keeps
+    one handle per path (closed at exit). Callers must not close it.
+    """
+    ds = _dem_cache.get(dem_path)
+    if ds is None or ds.closed:
+        ds = rasterio.open(dem_path, sharing=False)
+        _dem_cache[dem_path] = ds
+    return ds
+
+
+@atexit.register
+def _close_dems() -> None:
+    for ds in _dem_cache.values():
+        ds.close()
+    _dem_cache.clear()
+
+
+# Batch reads are aligned to this pixel grid so nearby batches resolve to the
+# same window and can be served from the tile cache below
+TILE_ALIGN_PX = 256
+TILE_CACHE_SIZE = 8
+
+_tile_cache: "OrderedDict[Tuple[Any, ...], Tuple[Any, ...]]" = OrderedDict()
+
+
+def read_dem_tile(ds, window: rasterio.windows.Window) -> Tuple[np.ndarray, np.ndarray, Any, Any]:
+    """
+    Read a DEM window as plain arrays, reusing recently read tiles.
+    
+    Returns (data, valid, win_transform, inv_transform). The cache is keyed on
+    the dataset name and integer window, so repeated opens of the same DEM
+    path share entries. Cached arrays are read-only.
+    """
+    key = (ds.name, int(window.col_off), int(window.row_off), int(window.width), int(window.height))
+    tile = _tile_cache.get(key)
+    if tile is not None:
+        _tile_cache.move_to_end(key)
+        return tile
+    
+    arr = ds.read(1, window=window, masked=True, out_dtype=np.float32)
+    data = arr.data
+    valid = ~np.ma.getmaskarray(arr)
+    data.flags.writeable = False
+    valid.flags.writeable = False
+    win_transform = ds.window_transform(window)
+    tile = (data, valid, win_transform, ~win_transform)
+    
+    _tile_cache[key] = tile
+    if len(_tile_cache) > TILE_CACHE_SIZE:
+        _tile_cache.popitem(last=False)
+    return tile
+
+
+def align_window(window: rasterio.windows.Window, ds) -> rasterio.windows.Window:
+    """Expand a window outward to TILE_ALIGN_PX boundaries, clipped to the dataset."""
+    col0 = int(math.floor(window.col_off)) // TILE_ALIGN_PX * TILE_ALIGN_PX
+    row0 = int(math.floor(window.row_off)) // TILE_ALIGN_PX * TILE_ALIGN_PX
+    col1 = -(-int(math.ceil(window.col_off + window.width)) // TILE_ALIGN_PX) * TILE_ALIGN_PX
+    row1 = -(-int(math.ceil(window.row_off + window.height)) // TILE_ALIGN_PX) * TILE_ALIGN_PX
+    aligned = rasterio.windows.Window(col0, row0, col1 - col0, row1 - row0)
+    return aligned.intersection(rasterio.windows.Window(0, 0, ds.width, ds.height))
+
+
 def deg_window_from_radius(lat: float, lon: float, radius_m: float) -> Tuple[float, float, float, float]:
     """Convert radius in meters to a bounding box in degrees."""
     lat_deg_per_m = 1.0 / 111320.0
@@ -39,8 +158,39 @@ def deg_window_from_radius(lat: float, lon: float, radius_m: float) -> Tuple[flo
     return (lon - dlon, lat - dlat, lon + dlon, lat + dlat)
 
 
+# 8 compass directions as (row, col) unit offsets, in feature order
+DIRECTION_NAMES = ["N", "S", "E", "W", "NE", "SE", "SW", "NW"]
+DIRECTION_OFFSETS = np.array([
+    [-1, 0],   # N
+    [1, 0],    # S
+    [0, 1],    # E
+    [0, -1],   # W
+    [-1, 1],   # NE
+    [1, 1],    # SE
+    [1, -1],   # SW
+    [-1, -1],  # NW
+])
+
+
+@lru_cache(maxsize=64)
+def direction_offsets(distance_cells: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row and column offsets of the 8 directional samples at `distance_cells`.
+    
+    distance_cells is effectively constant for a given radius and DEM
+    resolution, so the scaled offsets are built once and reused.
+    """
+    offsets = DIRECTION_OFFSETS * distance_cells
+    row_offsets = np.ascontiguousarray(offsets[:, 0])
+    col_offsets = np.ascontiguousarray(offsets[:, 1])
+    row_offsets.flags.writeable = False
+    col_offsets.flags.writeable = False
+    return row_offsets, col_offsets
+
+
 def compute_directional_gradients(
-    arr: np.ma.MaskedArray,
+    data: np.ndarray,
+    valid: np.ndarray,
     center_row: int,
     center_col: int,
     cell_size_m: float,
@@ -49,71 +199,69 @@ def compute_directional_gradients(
     """
     Compute elevation gradients in 8 directions from center point.
     
-    Returns the elevation DROP (positive = lower terrain) in each direction,
-    measured at `distance_cells` away from center.
+    `data` is the plain elevation array and `valid` its boolean validity
+    mask (True = has data). Returns the elevation DROP (positive = lower
+    terrain) in each direction, measured at `distance_cells` away from center.
     """
-    center_elev = arr[center_row, center_col]
-    if np.ma.is_masked(center_elev):
-        return {d: 0.0 for d in ["N", "S", "E", "W", "NE", "SE", "SW", "NW"]}
-    
-    directions = {
-        "N": (-1, 0),
-        "S": (1, 0),
-        "E": (0, 1),
-        "W": (0, -1),
-        "NE": (-1, 1),
-        "SE": (1, 1),
-        "SW": (1, -1),
-        "NW": (-1, -1),
-    }
-    
-    gradients = {}
-    for name, (dr, dc) in directions.items():
-        target_row = center_row + dr * distance_cells
-        target_col = center_col + dc * distance_cells
-        
-        # Check bounds
-        if 0 <= target_row < arr.shape[0] and 0 <= target_col < arr.shape[1]:
-            target_elev = arr[target_row, target_col]
-            if not np.ma.is_masked(target_elev):
-                # Positive gradient = terrain drops away (good for summit)
-                gradients[name] = float(center_elev - target_elev)
-            else:
-                gradients[name] = 0.0
-        else:
-            gradients[name] = 0.0
+    if not valid[center_row, center_col]:
+        return {d: 0.0 for d in DIRECTION_NAMES}
+    center_elev = data[center_row, center_col]
+    
+    # Gather all 8 target cells in one fancy-indexing call
+    row_offsets, col_offsets = direction_offsets(distance_cells)
+    rows = center_row + row_offsets
+    cols = center_col + col_offsets
+    in_bounds = (rows >= 0) & (rows < data.shape[0]) & (cols >= 0) & (cols < data.shape[1])
+    rows = np.clip(rows, 0, data.shape[0] - 1)
+    cols = np.clip(cols, 0, data.shape[1] - 1)
+    in_bounds &= valid[rows, cols]
+    
+    # Positive gradient = terrain drops away (good for summit)
+    gradients = np.where(in_bounds, center_elev - data[rows, cols], 0.0)
+    
+    return dict(zip(DIRECTION_NAMES, gradients.tolist()))
+
+
+def summarize_valid_elevations(valid_elevs: np.ndarray, center_elev: float) -> Tuple[float, float, float]:
+    """
+    Compute the window-wide elevation features from the valid cells.
     
-    return gradients
+    Returns (elev_rank, pct_lower, local_relief). `valid_elevs` is a plain
+    1-D ndarray of valid elevations (e.g. `data[valid]`).
+    """
+    n_valid = valid_elevs.size
+    cnt_lower = np.count_nonzero(valid_elevs < center_elev)
+    cnt_equal = np.count_nonzero(valid_elevs == center_elev)
+    elev_rank = float(cnt_lower + cnt_equal) / n_valid
+    pct_lower = float(cnt_lower) / n_valid
+    local_relief = float(valid_elevs.max() - valid_elevs.min())
+    return elev_rank, pct_lower, local_relief
 
 
-def compute_curvature(arr: np.ma.MaskedArray, row: int, col: int, cell_size_m: float) -> float:
+def compute_curvature(data: np.ndarray, valid: np.ndarray, row: int, col: int, cell_size_m: float) -> float:
     """
-    Compute Laplacian curvature at a point.
+    Compute Laplacian curvature at a point from the plain elevation array
+    and its validity mask.
     Positive = convex (summit), Negative = concave (valley)
     """
-    if row < 1 or row >= arr.shape[0] - 1 or col < 1 or col >= arr.shape[1] - 1:
+    if row < 1 or row >= data.shape[0] - 1 or col < 1 or col >= data.shape[1] - 1:
         return 0.0
     
-    center = arr[row, col]
-    if np.ma.is_masked(center):
+    if not (valid[row, col] and valid[row - 1, col] and valid[row + 1, col]
+            and valid[row, col - 1] and valid[row, col + 1]):
         return 0.0
     
-    # Get 4-neighbors
-    neighbors = [
-        arr[row - 1, col],  # N
-        arr[row + 1, col],  # S
-        arr[row, col - 1],  # W
-        arr[row, col + 1],  # E
-    ]
-    
-    if any(np.ma.is_masked(n) for n in neighbors):
-        return 0.0
-    
-    # Laplacian: sum of 2nd derivatives
-    laplacian = (sum(neighbors) - 4 * center) / (cell_size_m ** 2)
+    # Laplacian: sum of 2nd derivatives, as plain Python floats
+    center = float(data[row, col])
+    n = float(data[row - 1, col])
+    s = float(data[row + 1, col])
+    w = float(data[row, col - 1])
+    e = float(data[row, col + 1])
+    inv_cell2 = 1.0 / (cell_size_m * cell_size_m)
+    laplacian = (n + s + w + e - 4.0 * center) * inv_cell2
     
     # Negate so positive = convex summit
-    return -float(laplacian)
+    return -laplacian
 
 
 def extract_features(
@@ -138,17 +286,11 @@ def extract_features(
     """
     # Support both path (string) and already-open dataset
     if isinstance(dem_path_or_ds, str):
-        ds = rasterio.open(dem_path_or_ds)
-        should_close = True
+        ds = open_dem(dem_path_or_ds)
     else:
         ds = dem_path_or_ds
-        should_close = False
     
-    try:
-        return _extract_features_from_ds(ds, lat, lon, radius_m, seed_lat, seed_lon)
-    finally:
-        if should_close:
-            ds.close()
+    return _extract_features_from_ds(ds, lat, lon, radius_m, seed_lat, seed_lon)
 
 
 def _extract_features_from_ds(
@@ -161,22 +303,16 @@ def _extract_features_from_ds(
 ) -> Dict[str, Any]:
     """Internal: extract features from an already-open dataset."""
     # Check if we need coordinate transformation
-    crs = ds.crs
-    to_native = None
-    from_native = None
-    
-    if crs and not crs.is_geographic:
-        to_native = Transformer.from_crs("EPSG:4326", crs, always_xy=True)
-        from_native = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
+    to_native, _ = dem_transformers(ds)
     
     # Get bounding box
     min_lon, min_lat, max_lon, max_lat = deg_window_from_radius(lat, lon, radius_m)
     
-    # Transform to native CRS if needed
+    # Transform to native CRS if needed (corners and center in one call)
     if to_native:
-        min_x, min_y = to_native.transform(min_lon, min_lat)
-        max_x, max_y = to_native.transform(max_lon, max_lat)
-        center_x, center_y = to_native.transform(lon, lat)
+        (min_x, max_x, center_x), (min_y, max_y, center_y) = to_native.transform(
+            [min_lon, max_lon, lon], [min_lat, max_lat, lat]
+        )
     else:
         min_x, min_y = min_lon, min_lat
         max_x, max_y = max_lon, max_lat
@@ -188,38 +324,47 @@ def _extract_features_from_ds(
     except Exception:
         return {"error": "window_error"}
     
-    # Clip window to dataset bounds
+    # Clip window to dataset bounds, then widen it to whole pixels so the
+    # array lines up with the DEM grid (fractional windows get resampled)
     window = window.intersection(rasterio.windows.Window(0, 0, ds.width, ds.height))
+    col0, row0 = math.floor(window.col_off), math.floor(window.row_off)
+    window = rasterio.windows.Window(
+        col0, row0,
+        math.ceil(window.col_off + window.width) - col0,
+        math.ceil(window.row_off + window.height) - row0,
+    )
     
     if window.width < 3 or window.height < 3:
         return {"error": "window_too_small"}
     
-    # Read data
-    arr = ds.read(1, window=window, masked=True)
+    # Read data (single precision halves the bytes the reductions touch),
+    # then work on the plain array + validity mask from here on
+    arr = ds.read(1, window=window, masked=True, out_dtype=np.float32)
+    data = arr.data
+    valid = ~np.ma.getmaskarray(arr)
     
-    if arr.count() == 0:
+    if not valid.any():
         return {"error": "no_data"}
     
     # Get transform for this window
     win_transform = ds.window_transform(window)
     
-    # Find center point in array coordinates
+    # Find the cell containing the center point, in array coordinates
     inv_transform = ~win_transform
     center_col, center_row = inv_transform * (center_x, center_y)
-    center_row, center_col = int(round(center_row)), int(round(center_col))
+    center_row, center_col = int(math.floor(center_row)), int(math.floor(center_col))
     
     # Clamp to array bounds
-    center_row = max(0, min(arr.shape[0] - 1, center_row))
-    center_col = max(0, min(arr.shape[1] - 1, center_col))
+    center_row = max(0, min(data.shape[0] - 1, center_row))
+    center_col = max(0, min(data.shape[1] - 1, center_col))
     
-    center_elev = arr[center_row, center_col]
-    if np.ma.is_masked(center_elev):
+    if not valid[center_row, center_col]:
         return {"error": "center_masked"}
     
-    center_elev = float(center_elev)
+    center_elev = float(data[center_row, center_col])
     
     # Estimate cell size in meters
-    if crs and not crs.is_geographic:
+    if to_native:
         cell_size_m = abs(win_transform.a)  # Assume square cells
     else:
         # Geographic CRS - approximate meters
@@ -227,25 +372,23 @@ def _extract_features_from_ds(
     
     # === Feature Extraction ===
     
-    # 1. Elevation percentile rank (1.0 = highest point)
-    valid_elevs = arr.compressed()
-    elev_rank = float(np.sum(valid_elevs <= center_elev)) / len(valid_elevs)
+    # 1. Elevation percentile rank (1.0 = highest point), plus the other
+    #    window-wide reductions (pct_lower, local_relief) from the same cells
+    valid_elevs = data[valid]
+    elev_rank, pct_lower, local_relief = summarize_valid_elevations(valid_elevs, center_elev)
     
     # 2. Directional gradients (10 cells away, ~10-50m depending on resolution)
     distance_cells = max(1, int(round(radius_m / 5 / cell_size_m)))  # ~1/5 of radius
-    gradients = compute_directional_gradients(arr, center_row, center_col, cell_size_m, distance_cells)
+    gradients = compute_directional_gradients(data, valid, center_row, center_col, cell_size_m, distance_cells)
     
     # 3. Min gradient (for ridge vs peak detection)
     min_gradient = min(gradients.values())
     
-    # 4. Local relief
-    local_relief = float(valid_elevs.max() - valid_elevs.min())
-    
-    # 5. Percentage of cells lower than center
-    pct_lower = float(np.sum(valid_elevs < center_elev)) / len(valid_elevs)
+    # 4. Local relief and 5. percentage of cells lower than center
+    #    (computed above alongside elev_rank)
     
     # 6. Curvature (Laplacian)
-    curvature = compute_curvature(arr, center_row, center_col, cell_size_m)
+    curvature = compute_curvature(data, valid, center_row, center_col, cell_size_m)
     
     # 7. Distance to seed (if provided)
     if seed_lat is not None and seed_lon is not None:
@@ -284,6 +427,206 @@ def _extract_features_from_ds(
     }
 
 
+def extract_features_batch(
+    dem_path_or_ds,
+    coords: Sequence[Tuple[float, float]],
+    radius_m: float = 50.0,
+    seed_lat: Optional[float] = None,
+    seed_lon: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Extract topographic features for many points from a single DEM read.
+    
+    Reads one window covering every point (plus radius_m), then slices a
+    per-point sub-window from memory, the same way predict_summit scores its
+    candidates. Gradients and curvature are gathered for all points at once.
+    
+    Args:
+        dem_path_or_ds: Path to DEM file OR an already-open rasterio dataset
+        coords: Sequence of (lat, lon) points
+        radius_m: Radius around each point to analyze (default 50m)
+        seed_lat, seed_lon: Original seed coordinates (for dist_to_seed feature)
+    
+    Returns:
+        One feature dictionary per point, in input order (with an "error"
+        key for points that could not be extracted)
+    """
+    if len(coords) == 0:
+        return []
+    
+    if isinstance(dem_path_or_ds, str):
+        ds = open_dem(dem_path_or_ds)
+    else:
+        ds = dem_path_or_ds
+    
+    return _extract_features_batch_from_ds(ds, coords, radius_m, seed_lat, seed_lon)
+
+
+def _extract_features_batch_from_ds(
+    ds,
+    coords: Sequence[Tuple[float, float]],
+    radius_m: float,
+    seed_lat: Optional[float],
+    seed_lon: Optional[float],
+) -> List[Dict[str, Any]]:
+    """Internal: batch feature extraction from an already-open dataset."""
+    n_points = len(coords)
+    lats = np.array([c[0] for c in coords], dtype=np.float64)
+    lons = np.array([c[1] for c in coords], dtype=np.float64)
+    
+    to_native, _ = dem_transformers(ds)
+    is_projected = to_native is not None
+    
+    # Covering bounding box: union of every point's radius window
+    dlat = radius_m / 111320.0
+    dlon = radius_m / (111320.0 * np.cos(np.radians(lats)))
+    min_lon, max_lon = float((lons - dlon).min()), float((lons + dlon).max())
+    min_lat, max_lat = float(lats.min() - dlat), float(lats.max() + dlat)
+    
+    if is_projected:
+        (min_x, max_x), (min_y, max_y) = to_native.transform([min_lon, max_lon], [min_lat, max_lat])
+        center_x, center_y = to_native.transform(lons, lats)
+    else:
+        min_x, min_y, max_x, max_y = min_lon, min_lat, max_lon, max_lat
+        center_x, center_y = lons, lats
+    
+    try:
+        window = align_window(from_bounds(min_x, min_y, max_x, max_y, ds.transform), ds)
+    except Exception:
+        return [{"error": "window_error"} for _ in range(n_points)]
+    
+    # Read once (or reuse a cached tile) as plain ndarrays; per-point results
+    # only depend on each point's own sub-window, not on the tile extent
+    data, valid, win_transform, inv_transform = read_dem_tile(ds, window)
+    
+    if not valid.any():
+        return [{"error": "no_data"} for _ in range(n_points)]
+    
+    # Cell containing every point, in array coordinates
+    col_f, row_f = inv_transform * (np.asarray(center_x), np.asarray(center_y))
+    center_rows = np.floor(row_f).astype(np.intp)
+    center_cols = np.floor(col_f).astype(np.intp)
+    
+    # Per-point cell size
+    if is_projected:
+        cell_size_m = np.full(n_points, abs(win_transform.a))
+    else:
+        cell_size_m = abs(win_transform.a) * 111320 * np.cos(np.radians(lats))
+    
+    results = extract_features_at_cells(
+        data, valid, center_rows, center_cols, cell_size_m, radius_m, lats, lons, seed_lat, seed_lon
+    )
+    return [
+        f if "error" in f else {"lat": coords[i][0], "lon": coords[i][1], **f}
+        for i, f in enumerate(results)
+    ]
+
+
+def extract_features_at_cells(
+    data: np.ndarray,
+    valid: np.ndarray,
+    center_rows: np.ndarray,
+    center_cols: np.ndarray,
+    cell_size_m: np.ndarray,
+    radius_m: float,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    seed_lat: Optional[float],
+    seed_lon: Optional[float],
+) -> List[Dict[str, Any]]:
+    """
+    Extract features for many points at known (row, col) cells of one
+    in-memory elevation array and its validity mask.
+    
+    Gradients and curvature are computed for all points at once; each
+    point's sub-window is bounded as in extract_features. cell_size_m is
+    per point (meters); lats/lons are only used for dist_to_seed. Points
+    whose features can't be computed get {"error": ...}.
+    """
+    n_points = len(center_rows)
+    height, width = data.shape
+    
+    # Per-point directional sample distance and sub-window radius
+    distance_cells = np.maximum(1, np.rint(radius_m / 5 / cell_size_m).astype(np.intp))
+    cells_radius = np.ceil(radius_m / cell_size_m).astype(np.intp)
+    
+    r_min = np.maximum(0, center_rows - cells_radius)
+    r_max = np.minimum(height, center_rows + cells_radius + 1)
+    c_min = np.maximum(0, center_cols - cells_radius)
+    c_max = np.minimum(width, center_cols + cells_radius + 1)
+    
+    # Clamp to array bounds (points off the DEM get an empty sub-window above)
+    center_rows = np.clip(center_rows, 0, height - 1)
+    center_cols = np.clip(center_cols, 0, width - 1)
+    
+    center_elevs = data[center_rows, center_cols]
+    center_valid = valid[center_rows, center_cols]
+    
+    # Directional gradients for all points: (n_points, 8) target cells,
+    # bounded by each point's own sub-window
+    target_rows = center_rows[:, None] + DIRECTION_OFFSETS[:, 0] * distance_cells[:, None]
+    target_cols = center_cols[:, None] + DIRECTION_OFFSETS[:, 1] * distance_cells[:, None]
+    in_window = (
+        (target_rows >= r_min[:, None]) & (target_rows < r_max[:, None])
+        & (target_cols >= c_min[:, None]) & (target_cols < c_max[:, None])
+    )
+    target_rows = np.clip(target_rows, 0, height - 1)
+    target_cols = np.clip(target_cols, 0, width - 1)
+    in_window &= valid[target_rows, target_cols]
+    gradients = np.where(in_window, center_elevs[:, None] - data[target_rows, target_cols], 0.0)
+    
+    # Laplacian curvature from the 4-neighbors (0.0 at sub-window edges or
+    # next to nodata)
+    interior = (
+        (center_rows - 1 >= r_min) & (center_rows + 1 < r_max)
+        & (center_cols - 1 >= c_min) & (center_cols + 1 < c_max)
+    )
+    n_rows = np.clip(center_rows[:, None] + DIRECTION_OFFSETS[:4, 0], 0, height - 1)
+    n_cols = np.clip(center_cols[:, None] + DIRECTION_OFFSETS[:4, 1], 0, width - 1)
+    interior &= valid[n_rows, n_cols].all(axis=1)
+    neighbor_sum = data[n_rows, n_cols].sum(axis=1, dtype=np.float64)
+    laplacian = (neighbor_sum - 4 * center_elevs) / (cell_size_m ** 2)
+    curvature = np.where(interior, -laplacian, 0.0)
+    
+    results: List[Dict[str, Any]] = []
+    for i in range(n_points):
+        if r_max[i] - r_min[i] < 3 or c_max[i] - c_min[i] < 3:
+            results.append({"error": "window_too_small"})
+            continue
+        if not center_valid[i]:
+            results.append({"error": "center_masked"})
+            continue
+        
+        center_elev = float(center_elevs[i])
+        sub_valid = valid[r_min[i]:r_max[i], c_min[i]:c_max[i]]
+        valid_elevs = data[r_min[i]:r_max[i], c_min[i]:c_max[i]][sub_valid]
+        elev_rank, pct_lower, local_relief = summarize_valid_elevations(valid_elevs, center_elev)
+        
+        if seed_lat is not None and seed_lon is not None:
+            dist_to_seed = haversine_m(float(lats[i]), float(lons[i]), seed_lat, seed_lon)
+        else:
+            dist_to_seed = 0.0
+        
+        grads = gradients[i]
+        features = {
+            "elevation": center_elev,
+            "elev_rank": elev_rank,
+        }
+        features.update(zip(("gradient_" + d for d in DIRECTION_NAMES), grads.tolist()))
+        features.update({
+            "min_gradient": float(grads.min()),
+            "mean_gradient": float(grads.sum() / len(grads)),
+            "grad_variance": float(np.var(grads)),
+            "local_relief": local_relief,
+            "pct_lower": pct_lower,
+            "curvature": float(curvature[i]),
+            "dist_to_seed": dist_to_seed,
+        })
+        results.append(features)
+    
+    return results
+
+
 def get_feature_names() -> list:
     """Return list of feature names in consistent order for ML."""
     return [
@@ -306,12 +649,35 @@ def get_feature_names() -> list:
     ]
 
 
+# Pulls every model feature out of a feature dict in get_feature_names() order
+_feature_getter = operator.itemgetter(*get_feature_names())
+
+
 def features_to_vector(features: Dict[str, Any]) -> Optional[list]:
-    """Convert feature dict to vector for ML model."""
+    """Convert feature dict to vector for ML model (None if extraction failed)."""
     if "error" in features:
         return None
     
-    return [features[name] for name in get_feature_names()]
+    try:
+        return list(_feature_getter(features))
+    except KeyError:
+        return None
+
+
+def features_to_vector_into(features: Dict[str, Any], out: np.ndarray) -> bool:
+    """
+    Write the feature vector into a preallocated row (e.g. of a batch
+    matrix) instead of building a list. Returns False, leaving out
+    untouched, if extraction failed.
+    """
+    if "error" in features:
+        return False
+    
+    try:
+        out[:] = _feature_getter(features)
+    except KeyError:
+        return False
+    return True
 
 
 # === CLI for testing ===
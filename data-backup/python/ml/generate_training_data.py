@@ -3,10 +3,11 @@
 Generate training data for ML summit detection.
 
 Queries verified peaks from the database (14ers + DEM-verified 13ers),
-generates negative samples, extracts features, and outputs training_data.csv.
+generates negative samples, extracts features, and outputs training_data.csv
+(or Parquet when the output ends in .parquet; requires pyarrow).
 
 Usage:
-    python generate_training_data.py --dem-path <path> --output <csv>
+    python generate_training_data.py --dem-path <path> --output <csv|parquet>
 
 Environment variables for DB connection:
     PG_HOST, PG_PORT, PG_USER, PG_PASSWORD, PG_DATABASE
@@ -15,16 +16,65 @@ Environment variables for DB connection:
 import os
 import sys
 import math
-import random
 import argparse
 import json
-from typing import List, Dict, Any, Tuple, Optional
+import importlib.util
+import io
+import itertools
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, Optional, Iterable, Iterator
 
 import numpy as np
 import pandas as pd
 import psycopg2
+import rasterio
+from rasterio.windows import from_bounds
+from scipy.ndimage import sobel
 
-from extract_features import extract_features, get_feature_names, features_to_vector
+from extract_features import (
+    extract_features_batch,
+    get_feature_names,
+    features_to_vector,
+    dem_transformers,
+    open_dem,
+)
+
+
+# Peaks are grouped into buckets of this size (degrees) and each bucket's
+# search windows are read from the DEM as one block
+TILE_BUCKET_DEG = 0.1
+MAX_TILE_PIXELS = 16_000_000
+
+# Random negatives whose pixel is within this many meters of the summit pixel
+# are rejected before feature extraction (likely another summit)
+RANDOM_NEGATIVE_MIN_DROP_M = 10.0
+
+# CSV output is appended this many peaks at a time
+CSV_FLUSH_PEAKS = 256
+
+# Buckets submitted to the worker pool ahead of the one being yielded, per
+# worker (bounds how many finished buckets wait in memory)
+BUCKETS_IN_FLIGHT_PER_WORKER = 2
+
+
+def output_format_for(path: str) -> str:
+    """Pick the output format from the file extension (Parquet or CSV)."""
+    return "parquet" if path.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def write_parquet(df: pd.DataFrame, path: str) -> None:
+    """
+    Write training data as zstd-compressed Parquet.
+    
+    The repeated string columns are stored as categoricals so Parquet can
+    dictionary-encode them; feature columns are already float32.
+    """
+    out = df.copy()
+    for col in ("peak_name", "sample_type"):
+        out[col] = out[col].astype("category")
+    out.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
 
 
 def get_db_connection():
@@ -49,9 +99,12 @@ def fetch_verified_peaks(
     Returns peaks that are either:
     - 14ers (elevation >= 4267m) - trusted ground truth
     - 13ers with snapped_distance_m < threshold - DEM-verified
+    
+    Rows are bulk-exported with COPY ... TO STDOUT and parsed by pandas'
+    C CSV reader, then returned as dicts keyed by column name (NULL -> None).
     """
     with conn.cursor() as cur:
-        cur.execute("""
+        query = cur.mogrify("""
             SELECT 
                 p.id,
                 p.name,
@@ -70,48 +123,205 @@ def fetch_verified_peaks(
                   OR p.snapped_distance_m < %s  -- 13ers: DEM-verified only
               )
             ORDER BY p.elevation DESC
-        """, (min_elevation_14er, max_snap_distance_13er))
-        
-        columns = [desc[0] for desc in cur.description]
-        peaks = [dict(zip(columns, row)) for row in cur.fetchall()]
+        """, (min_elevation_14er, max_snap_distance_13er)).decode()
+        buf = io.StringIO()
+        cur.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", buf)
+    
+    buf.seek(0)
+    df = pd.read_csv(buf, dtype={"id": str, "name": str}, keep_default_na=False, na_values=[""])
+    peaks = df.astype(object).where(df.notna(), None).to_dict("records")
     
     return peaks
 
 
-def generate_negative_sample(
+def meters_to_latlon_offsets(
+    angle: np.ndarray,
+    distance: np.ndarray,
+    lat: Any,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert bearings (radians, 0 = north) and distances (m) at latitude lat
+    into (dlat, dlon) degree offsets. Broadcasts over array inputs.
+    """
+    lat_per_m = 1.0 / 111320.0
+    lon_per_m = 1.0 / (111320.0 * np.cos(np.radians(lat)))
+    return distance * np.cos(angle) * lat_per_m, distance * np.sin(angle) * lon_per_m
+
+
+def generate_negative_samples_batch(
     lat: float,
     lon: float,
+    n: int,
+    rng: np.random.Generator,
     min_distance_m: float = 50.0,
     max_distance_m: float = 150.0,
-) -> Tuple[float, float]:
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Generate a random point at a distance from the summit.
+    Generate n random points at a distance from the summit.
     
-    The point is placed in a random direction, at a random distance
-    between min_distance_m and max_distance_m.
+    Each point is placed in a random direction, at a random distance
+    between min_distance_m and max_distance_m. Returns (lats, lons) arrays.
     """
-    # Random angle (radians)
-    angle = random.uniform(0, 2 * math.pi)
+    # Random angles (radians) and distances
+    angles = rng.uniform(0, 2 * np.pi, n)
+    distances = rng.uniform(min_distance_m, max_distance_m, n)
     
-    # Random distance
-    distance = random.uniform(min_distance_m, max_distance_m)
+    dlats, dlons = meters_to_latlon_offsets(angles, distances, lat)
+    return lat + dlats, lon + dlons
+
+
+def native_bounds(
+    to_native,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    radius_m: float,
+) -> np.ndarray:
+    """
+    Compute (min_x, min_y, max_x, max_y) search boxes for many points at once.
     
-    # Convert to lat/lon offset
-    lat_per_m = 1.0 / 111320.0
-    lon_per_m = 1.0 / (111320.0 * math.cos(math.radians(lat)))
+    The boxes are radius_m around each point in degrees, projected into the
+    DEM CRS with one vectorized Transformer call per corner.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    dlat = radius_m / 111320.0
+    dlon = radius_m / (111320.0 * np.cos(np.radians(lats)))
     
-    dlat = distance * math.cos(angle) * lat_per_m
-    dlon = distance * math.sin(angle) * lon_per_m
+    min_x, min_y = lons - dlon, lats - dlat
+    max_x, max_y = lons + dlon, lats + dlat
+    if to_native:
+        min_x, min_y = to_native.transform(min_x, min_y)
+        max_x, max_y = to_native.transform(max_x, max_y)
     
-    return lat + dlat, lon + dlon
+    return np.column_stack([min_x, min_y, max_x, max_y])
+
+
+def search_window(
+    ds,
+    bounds: Tuple[float, float, float, float],
+) -> Optional[rasterio.windows.Window]:
+    """
+    Whole-pixel window covering native bounds, clipped to the dataset.
+    Returns None when the bounds fall outside the DEM.
+    """
+    min_x, min_y, max_x, max_y = bounds
+    try:
+        window = from_bounds(min_x, min_y, max_x, max_y, ds.transform)
+    except Exception:
+        return None
+    
+    # Snap outwards to pixel edges so the window can be sliced from a tile
+    col0 = math.floor(round(window.col_off, 6))
+    row0 = math.floor(round(window.row_off, 6))
+    col1 = math.ceil(round(window.col_off + window.width, 6))
+    row1 = math.ceil(round(window.row_off + window.height, 6))
+    try:
+        return rasterio.windows.Window(col0, row0, col1 - col0, row1 - row0).intersection(
+            rasterio.windows.Window(0, 0, ds.width, ds.height)
+        )
+    except Exception:
+        return None
+
+
+def read_search_tile(
+    ds,
+    windows: List[rasterio.windows.Window],
+) -> Optional[Tuple[rasterio.windows.Window, np.ma.MaskedArray]]:
+    """
+    Read one block covering all of `windows` so nearby peaks share a single
+    DEM read. Returns None when sharing is not worthwhile (fewer than two
+    windows, or a union larger than MAX_TILE_PIXELS).
+    """
+    if len(windows) < 2:
+        return None
+    tile_window = rasterio.windows.union(windows)
+    if tile_window.width * tile_window.height > MAX_TILE_PIXELS:
+        return None
+    return tile_window, ds.read(1, window=tile_window, masked=True, out_dtype=np.float32)
+
+
+def read_search_window(
+    ds,
+    window: rasterio.windows.Window,
+    tile: Optional[Tuple[rasterio.windows.Window, np.ma.MaskedArray]] = None,
+) -> np.ma.MaskedArray:
+    """Slice `window` out of a pre-read tile when it fits, else read it from the DEM."""
+    if tile is not None:
+        tile_window, tile_arr = tile
+        r = window.row_off - tile_window.row_off
+        c = window.col_off - tile_window.col_off
+        if (
+            r >= 0 and c >= 0
+            and r + window.height <= tile_window.height
+            and c + window.width <= tile_window.width
+        ):
+            return tile_arr[r:r + window.height, c:c + window.width]
+    return ds.read(1, window=window, masked=True, out_dtype=np.float32)
+
+
+def local_maxima_5x5(elevs: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Boolean mask of valid pixels equal to the max of their 5x5 neighborhood.
+    
+    Runs the max as two 5-tap passes (rows, then columns) over a -inf padded
+    copy; masked pixels should already be -inf in `elevs`.
+    """
+    h, w = elevs.shape
+    padded = np.full((h + 4, w + 4), -np.inf, dtype=elevs.dtype)
+    padded[2:-2, 2:-2] = elevs
+    
+    row_max = padded[:, 0:w].copy()
+    for k in range(1, 5):
+        np.maximum(row_max, padded[:, k:k + w], out=row_max)
+    
+    local_max = row_max[0:h].copy()
+    for k in range(1, 5):
+        np.maximum(local_max, row_max[k:k + h], out=local_max)
+    
+    return (elevs == local_max) & valid
+
+
+def sample_elevations(
+    ds,
+    to_native,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    tile: Optional[Tuple[rasterio.windows.Window, np.ma.MaskedArray]] = None,
+) -> np.ndarray:
+    """
+    Elevation of the pixel under each point (NaN off the DEM or on nodata).
+    
+    All points are served by one read of their bounding window, sliced from
+    `tile` when it covers them.
+    """
+    xs, ys = (to_native.transform(lons, lats) if to_native else (lons, lats))
+    cols, rows = ~ds.transform * (np.asarray(xs), np.asarray(ys))
+    rows = np.floor(rows).astype(np.int64)
+    cols = np.floor(cols).astype(np.int64)
+    
+    elevs = np.full(len(rows), np.nan)
+    inside = (rows >= 0) & (rows < ds.height) & (cols >= 0) & (cols < ds.width)
+    if not inside.any():
+        return elevs
+    
+    rows, cols = rows[inside], cols[inside]
+    row0, col0 = int(rows.min()), int(cols.min())
+    window = rasterio.windows.Window(col0, row0, int(cols.max()) - col0 + 1, int(rows.max()) - row0 + 1)
+    arr = read_search_window(ds, window, tile)
+    elevs[inside] = arr.filled(np.nan)[rows - row0, cols - col0]
+    return elevs
 
 
 def find_secondary_peaks(
-    dem_path: str,
+    ds,
+    to_native,
+    from_native,
     lat: float,
     lon: float,
     radius_m: float = 150.0,
     min_prominence_m: float = 5.0,
+    bounds: Optional[Tuple[float, float, float, float]] = None,
+    tile: Optional[Tuple[rasterio.windows.Window, np.ma.MaskedArray]] = None,
 ) -> List[Tuple[float, float, float]]:
     """
     Find secondary peaks (local maxima) near the true summit.
@@ -119,97 +329,98 @@ def find_secondary_peaks(
     These are "hard negatives" - points that look like summits but aren't
     the highest point. Critical for training ridge/dual-peak detection.
     
+    ds is an open DEM dataset; to_native/from_native are the WGS84 <-> DEM
+    CRS Transformers (None for geographic DEMs). bounds is the precomputed
+    native search box from native_bounds; computed here when omitted. tile
+    is an optional pre-read (window, array) block from read_search_tile.
+    
     Returns list of (lat, lon, elevation) for secondary peaks.
     """
-    import rasterio
-    from rasterio.windows import from_bounds
-    from scipy.ndimage import maximum_filter
-    from pyproj import Transformer
+    if bounds is None:
+        bounds = native_bounds(to_native, [lat], [lon], radius_m)[0]
     
-    with rasterio.open(dem_path) as ds:
-        crs = ds.crs
-        to_native = None
-        from_native = None
-        
-        if crs and not crs.is_geographic:
-            to_native = Transformer.from_crs("EPSG:4326", crs, always_xy=True)
-            from_native = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
-        
-        # Get bounding box
-        lat_per_m = 1.0 / 111320.0
-        lon_per_m = 1.0 / (111320.0 * math.cos(math.radians(lat)))
-        dlat = radius_m * lat_per_m
-        dlon = radius_m * lon_per_m
-        
-        min_lon, min_lat = lon - dlon, lat - dlat
-        max_lon, max_lat = lon + dlon, lat + dlat
-        
-        if to_native:
-            min_x, min_y = to_native.transform(min_lon, min_lat)
-            max_x, max_y = to_native.transform(max_lon, max_lat)
-        else:
-            min_x, min_y = min_lon, min_lat
-            max_x, max_y = max_lon, max_lat
-        
-        try:
-            window = from_bounds(min_x, min_y, max_x, max_y, ds.transform)
-            window = window.intersection(rasterio.windows.Window(0, 0, ds.width, ds.height))
-        except Exception:
-            return []
-        
-        if window.width < 5 or window.height < 5:
-            return []
-        
-        arr = ds.read(1, window=window, masked=True)
-        if arr.count() == 0:
-            return []
-        
-        win_transform = ds.window_transform(window)
-        
-        # Find local maxima (5x5 window)
-        local_max = maximum_filter(arr.filled(-np.inf), size=5)
-        is_local_max = (arr.data == local_max) & (~arr.mask)
-        
-        # Get the true summit elevation (should be the max)
-        true_summit_elev = float(arr.max())
-        
-        # Find secondary peaks (local max but not the global max)
-        secondary = []
-        rows, cols = np.where(is_local_max)
-        
-        for r, c in zip(rows, cols):
-            elev = float(arr[r, c])
-            
-            # Skip if this IS the true summit
-            if abs(elev - true_summit_elev) < 0.5:
-                continue
-            
-            # Skip if too low (not a significant secondary peak)
-            if true_summit_elev - elev > 50:  # More than 50m lower
-                continue
-            
-            # Must have some prominence (not just noise)
-            if true_summit_elev - elev < min_prominence_m:
-                continue
-            
-            # Convert to geographic coords
-            x, y = win_transform * (c + 0.5, r + 0.5)
-            if from_native:
-                sec_lon, sec_lat = from_native.transform(x, y)
-            else:
-                sec_lon, sec_lat = x, y
-            
-            secondary.append((sec_lat, sec_lon, elev))
-        
-        return secondary
+    window = search_window(ds, bounds)
+    if window is None or window.width < 5 or window.height < 5:
+        return []
+    
+    arr = read_search_window(ds, window, tile)
+    if arr.count() == 0:
+        return []
+    
+    win_transform = ds.window_transform(window)
+    
+    # Find local maxima (5x5 window)
+    is_local_max = local_maxima_5x5(arr.filled(-np.inf), ~np.ma.getmaskarray(arr))
+    
+    # Get the true summit elevation (should be the max)
+    true_summit_elev = float(arr.max())
+    
+    # Find secondary peaks (local max but not the global max)
+    rows, cols = np.nonzero(is_local_max)
+    elevs = arr.data[rows, cols].astype(np.float64)
+    drop = true_summit_elev - elevs
+    
+    # Skip the true summit itself, peaks more than 50m lower, and peaks
+    # without some prominence (just noise)
+    keep = (np.abs(elevs - true_summit_elev) >= 0.5) & (drop <= 50) & (drop >= min_prominence_m)
+    rows, cols, elevs = rows[keep], cols[keep], elevs[keep]
+    
+    # Convert to geographic coords
+    xs, ys = win_transform * (cols + 0.5, rows + 0.5)
+    if from_native:
+        sec_lons, sec_lats = from_native.transform(xs, ys)
+    else:
+        sec_lons, sec_lats = xs, ys
+    
+    return list(zip(np.asarray(sec_lats).tolist(), np.asarray(sec_lons).tolist(), elevs.tolist()))
+
+
+def _scan_ridge_candidates(
+    filled: np.ndarray,
+    mask: np.ndarray,
+    grad_x: np.ndarray,
+    grad_y: np.ndarray,
+    elev_threshold: float,
+    min_asym: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Collect ridge-like pixels away from the window border.
+    
+    Returns (rows, cols, scores) in raster order for valid pixels at or above
+    elev_threshold whose gradient asymmetry |(|gx| - |gy|)| / (|g| + 1e-6)
+    is at least min_asym. Asymmetry is only evaluated at the high pixels.
+    """
+    inner = (slice(2, filled.shape[0] - 2), slice(2, filled.shape[1] - 2))
+    
+    with np.errstate(invalid='ignore'):
+        high = (~mask[inner]) & (filled[inner] >= elev_threshold)
+    rows, cols = np.nonzero(high)
+    rows += 2
+    cols += 2
+    
+    gx = grad_x[rows, cols]
+    gy = grad_y[rows, cols]
+    mag = np.hypot(gx, gy)
+    mag += 1e-6
+    
+    # NaN asymmetry (gradients touching nodata) compares False and drops out
+    with np.errstate(divide='ignore', invalid='ignore'):
+        asym = np.abs(np.abs(gx) - np.abs(gy)) / mag
+        keep = asym >= min_asym
+    
+    return rows[keep], cols[keep], asym[keep].astype(np.float64)
 
 
 def find_ridge_points(
-    dem_path: str,
+    ds,
+    to_native,
+    from_native,
     summit_lat: float,
     summit_lon: float,
     radius_m: float = 100.0,
     num_points: int = 4,
+    bounds: Optional[Tuple[float, float, float, float]] = None,
+    tile: Optional[Tuple[rasterio.windows.Window, np.ma.MaskedArray]] = None,
 ) -> List[Tuple[float, float]]:
     """
     Find points along ridges leading to the summit.
@@ -217,108 +428,332 @@ def find_ridge_points(
     These are "hard negatives" - high points that drop in only 2 directions
     (along ridge axis) but are flat or rising in the other 2 (perpendicular).
     
+    ds is an open DEM dataset; to_native/from_native are the WGS84 <-> DEM
+    CRS Transformers (None for geographic DEMs). bounds is the precomputed
+    native search box from native_bounds; computed here when omitted. tile
+    is an optional pre-read (window, array) block from read_search_tile.
+    
     Returns list of (lat, lon) for ridge points.
     """
-    import rasterio
-    from rasterio.windows import from_bounds
-    from scipy.ndimage import sobel
-    from pyproj import Transformer
+    if bounds is None:
+        bounds = native_bounds(to_native, [summit_lat], [summit_lon], radius_m)[0]
     
-    with rasterio.open(dem_path) as ds:
-        crs = ds.crs
-        to_native = None
-        from_native = None
-        
-        if crs and not crs.is_geographic:
-            to_native = Transformer.from_crs("EPSG:4326", crs, always_xy=True)
-            from_native = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
-        
-        lat_per_m = 1.0 / 111320.0
-        lon_per_m = 1.0 / (111320.0 * math.cos(math.radians(summit_lat)))
-        dlat = radius_m * lat_per_m
-        dlon = radius_m * lon_per_m
-        
-        min_lon, min_lat = summit_lon - dlon, summit_lat - dlat
-        max_lon, max_lat = summit_lon + dlon, summit_lat + dlat
-        
-        if to_native:
-            min_x, min_y = to_native.transform(min_lon, min_lat)
-            max_x, max_y = to_native.transform(max_lon, max_lat)
-        else:
-            min_x, min_y = min_lon, min_lat
-            max_x, max_y = max_lon, max_lat
-        
+    window = search_window(ds, bounds)
+    if window is None or window.width < 5 or window.height < 5:
+        return []
+    
+    arr = read_search_window(ds, window, tile)
+    if arr.count() == 0:
+        return []
+    
+    win_transform = ds.window_transform(window)
+    filled = arr.filled(np.nan).astype(np.float32, copy=False)
+    
+    # Compute gradients
+    grad_x = sobel(filled, axis=1, output=np.empty_like(filled), mode='constant', cval=np.nan)
+    grad_y = sobel(filled, axis=0, output=np.empty_like(filled), mode='constant', cval=np.nan)
+    
+    # Also need to be relatively high elevation
+    elev_threshold = float(arr.max()) - 30  # Within 30m of summit
+    
+    # Ridge points have high gradient magnitude but in only one direction
+    # (i.e., |grad_x| >> |grad_y| or vice versa)
+    rows, cols, scores = _scan_ridge_candidates(
+        filled, np.ma.getmaskarray(arr), grad_x, grad_y, elev_threshold, 0.5
+    )
+    
+    xs, ys = win_transform * (cols + 0.5, rows + 0.5)
+    if from_native:
+        pt_lons, pt_lats = from_native.transform(xs, ys)
+    else:
+        pt_lons, pt_lats = xs, ys
+    
+    # Don't include points too close to summit
+    dist = np.sqrt((pt_lats - summit_lat)**2 + (pt_lons - summit_lon)**2) * 111320
+    keep = dist >= 20
+    pt_lats, pt_lons, scores = pt_lats[keep], pt_lons[keep], scores[keep]
+    
+    # Sort by asymmetry (most ridge-like first) and take top N; partition
+    # down to the pixels tied with or above the N-th score and only sort
+    # those (ties stay in raster order)
+    neg_scores = -scores
+    if 0 < num_points < len(neg_scores):
+        kth = np.partition(neg_scores, num_points - 1)[num_points - 1]
+        subset = np.flatnonzero(neg_scores <= kth)
+    else:
+        subset = np.arange(len(neg_scores))
+    order = subset[np.argsort(neg_scores[subset], kind="stable")][:num_points]
+    return list(zip(pt_lats[order].tolist(), pt_lons[order].tolist()))
+
+
+# Per-sample identity columns; feature columns follow in get_feature_names() order
+META_COLUMNS = ["peak_id", "peak_name", "sample_type", "lat", "lon", "label"]
+FEATURE_NAMES = get_feature_names()
+
+
+def new_columns() -> Dict[str, list]:
+    """Return empty per-column lists for accumulating training samples."""
+    return {name: [] for name in META_COLUMNS + FEATURE_NAMES}
+
+
+def append_sample(
+    cols: Dict[str, list],
+    peak_id: Any,
+    peak_name: str,
+    sample_type: str,
+    lat: float,
+    lon: float,
+    label: int,
+    features: Dict[str, Any],
+) -> None:
+    """Append one labelled sample to the column lists."""
+    cols["peak_id"].append(peak_id)
+    cols["peak_name"].append(peak_name)
+    cols["sample_type"].append(sample_type)
+    cols["lat"].append(lat)
+    cols["lon"].append(lon)
+    cols["label"].append(label)
+    for fname in FEATURE_NAMES:
+        cols[fname].append(features[fname])
+
+
+# Column dtypes for the assembled training frame; features are float32
+COLUMN_DTYPES = {
+    "peak_id": object,
+    "peak_name": object,
+    "sample_type": object,
+    "lat": np.float64,
+    "lon": np.float64,
+    "label": np.int8,
+    **{fname: np.float32 for fname in FEATURE_NAMES},
+}
+
+
+def columns_to_frame(parts: List[Dict[str, list]]) -> pd.DataFrame:
+    """
+    Build the training DataFrame from per-peak column lists.
+    
+    Each column is preallocated once at the total sample count and filled
+    slice by slice, so no intermediate concatenated lists are built.
+    """
+    n = sum(len(part["label"]) for part in parts)
+    frame = {name: np.empty(n, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+    
+    k = 0
+    for part in parts:
+        m = len(part["label"])
+        for name, values in part.items():
+            frame[name][k:k + m] = values
+        k += m
+    
+    return pd.DataFrame(frame, copy=False)
+
+
+def peak_seed(seed: int, peak_id: Any) -> np.random.SeedSequence:
+    """
+    Derive a stable per-peak RNG seed so results don't depend on scheduling.
+    
+    The run seed and a hash of the peak id are mixed by SeedSequence, so
+    different (seed, peak) pairs get independent streams.
+    """
+    return np.random.SeedSequence([seed % (2 ** 32), zlib.crc32(str(peak_id).encode("utf-8"))])
+
+
+def process_peak(
+    ds,
+    to_native,
+    from_native,
+    peak: Dict[str, Any],
+    negatives_per_positive: int = 4,
+    feature_radius_m: float = 50.0,
+    include_hard_negatives: bool = True,
+    seed: int = 42,
+    secondary_bounds: Optional[Tuple[float, float, float, float]] = None,
+    ridge_bounds: Optional[Tuple[float, float, float, float]] = None,
+    tile: Optional[Tuple[rasterio.windows.Window, np.ma.MaskedArray]] = None,
+) -> Tuple[Dict[str, list], List[str]]:
+    """
+    Build all training samples for one verified peak.
+    
+    Returns (cols, warnings) where cols maps column name to values (see
+    new_columns); warnings are returned rather than printed so
+    output stays ordered when peaks are processed in worker processes.
+    """
+    cols = new_columns()
+    warnings = []
+    rng = np.random.default_rng(peak_seed(seed, peak["id"]))
+    
+    peak_id = peak["id"]
+    peak_name = peak["name"]
+    lat = peak["lat"]
+    lon = peak["lon"]
+    seed_lat = peak.get("seed_lat", lat)
+    seed_lon = peak.get("seed_lon", lon)
+    
+    # === Hard negatives: secondary peaks and ridge points ===
+    secondary_peaks = []
+    ridge_points = []
+    search_warnings = []
+    if include_hard_negatives:
         try:
-            window = from_bounds(min_x, min_y, max_x, max_y, ds.transform)
-            window = window.intersection(rasterio.windows.Window(0, 0, ds.width, ds.height))
-        except Exception:
-            return []
-        
-        if window.width < 5 or window.height < 5:
-            return []
-        
-        arr = ds.read(1, window=window, masked=True)
-        if arr.count() == 0:
-            return []
-        
-        win_transform = ds.window_transform(window)
-        filled = arr.filled(np.nan)
-        
-        # Compute gradients
-        grad_x = sobel(filled, axis=1, mode='constant', cval=np.nan)
-        grad_y = sobel(filled, axis=0, mode='constant', cval=np.nan)
-        
-        # Ridge points have high gradient magnitude but in only one direction
-        # (i.e., |grad_x| >> |grad_y| or vice versa)
-        grad_mag = np.sqrt(grad_x**2 + grad_y**2)
-        
-        # Find points with high gradient asymmetry (ridge-like)
-        with np.errstate(divide='ignore', invalid='ignore'):
-            asymmetry = np.abs(np.abs(grad_x) - np.abs(grad_y)) / (grad_mag + 1e-6)
+            secondary_peaks = find_secondary_peaks(
+                ds, to_native, from_native, lat, lon, radius_m=150.0,
+                bounds=secondary_bounds, tile=tile,
+            )[:2]  # Max 2 per peak
+        except Exception as e:
+            search_warnings.append(f"  WARNING: Error finding secondary peaks: {e}")
+        try:
+            ridge_points = find_ridge_points(
+                ds, to_native, from_native, lat, lon, radius_m=100.0, num_points=2,
+                bounds=ridge_bounds, tile=tile,
+            )
+        except Exception as e:
+            search_warnings.append(f"  WARNING: Error finding ridge points: {e}")
+    
+    # === Random negative candidates (easier cases) ===
+    # Reduce random negatives if we have hard negatives
+    random_negatives_target = negatives_per_positive - 2 if include_hard_negatives else negatives_per_positive
+    max_attempts = random_negatives_target * 3
+    neg_lats, neg_lons = generate_negative_samples_batch(lat, lon, max(max_attempts, 0), rng)
+    
+    # Cheap pre-filter: look up the pixel under the summit and every candidate
+    # in one small read and drop candidates nearly as high as the summit
+    # before paying for feature extraction
+    too_high = np.zeros(len(neg_lats), dtype=bool)
+    if len(neg_lats) > 0:
+        point_elevs = sample_elevations(
+            ds, to_native, np.append(lat, neg_lats), np.append(lon, neg_lons), tile
+        )
+        with np.errstate(invalid='ignore'):
+            too_high = point_elevs[1:] > point_elevs[0] - RANDOM_NEGATIVE_MIN_DROP_M
+    neg_points = [
+        (float(neg_lat), float(neg_lon))
+        for neg_lat, neg_lon, skip in zip(neg_lats, neg_lons, too_high)
+        if not skip
+    ]
+    
+    # Extract features for every sample point from one shared DEM read
+    coords = [(lat, lon)] + [(s[0], s[1]) for s in secondary_peaks] + ridge_points + neg_points
+    all_features = iter(extract_features_batch(ds, coords, feature_radius_m, seed_lat, seed_lon))
+    
+    # === Positive sample (the actual summit) ===
+    pos_features = next(all_features)
+    if "error" in pos_features:
+        warnings.append(f"  WARNING: Error extracting positive features: {pos_features['error']}")
+        return cols, warnings
+    warnings.extend(search_warnings)
+    
+    append_sample(cols, peak_id, peak_name, "positive", lat, lon, 1, pos_features)
+    
+    for sec_lat, sec_lon, sec_elev in secondary_peaks:
+        sec_features = next(all_features)
+        if "error" not in sec_features:
+            append_sample(cols, peak_id, peak_name, "secondary_peak", sec_lat, sec_lon, 0, sec_features)
+    
+    for ridge_lat, ridge_lon in ridge_points:
+        ridge_features = next(all_features)
+        if "error" not in ridge_features:
+            append_sample(cols, peak_id, peak_name, "ridge", ridge_lat, ridge_lon, 0, ridge_features)
+    
+    # Take random negatives in draw order until the target is met
+    neg_count = 0
+    for (neg_lat, neg_lon), neg_features in zip(neg_points, all_features):
+        if neg_count >= random_negatives_target:
+            break
         
-        # Also need to be relatively high elevation
-        elev_threshold = float(arr.max()) - 30  # Within 30m of summit
+        if "error" in neg_features:
+            continue  # Skip invalid points
         
-        candidates = []
-        for r in range(2, arr.shape[0] - 2):
-            for c in range(2, arr.shape[1] - 2):
-                if arr.mask[r, c]:
-                    continue
-                if arr[r, c] < elev_threshold:
-                    continue
-                if asymmetry[r, c] < 0.5:  # Not ridge-like enough
-                    continue
-                if np.isnan(asymmetry[r, c]):
-                    continue
-                
-                x, y = win_transform * (c + 0.5, r + 0.5)
-                if from_native:
-                    pt_lon, pt_lat = from_native.transform(x, y)
-                else:
-                    pt_lon, pt_lat = x, y
-                
-                # Don't include points too close to summit
-                dist = math.sqrt((pt_lat - summit_lat)**2 + (pt_lon - summit_lon)**2) * 111320
-                if dist < 20:
-                    continue
-                
-                candidates.append((pt_lat, pt_lon, float(asymmetry[r, c])))
+        # Skip if this point is actually very high (might be another summit)
+        if neg_features["elev_rank"] > 0.95 and neg_features["pct_lower"] > 0.9:
+            continue  # Too summit-like, skip
         
-        # Sort by asymmetry (most ridge-like first) and take top N
-        candidates.sort(key=lambda x: -x[2])
-        return [(c[0], c[1]) for c in candidates[:num_points]]
+        append_sample(cols, peak_id, peak_name, "random", neg_lat, neg_lon, 0, neg_features)
+        neg_count += 1
+    
+    if neg_count < random_negatives_target:
+        warnings.append(f"  WARNING: Only generated {neg_count}/{random_negatives_target} random negatives")
+    
+    return cols, warnings
 
 
-def generate_training_data(
+def process_peak_group(
+    ds,
+    to_native,
+    from_native,
+    group: List[Tuple[int, Dict[str, Any], Any, Any]],
+    options: Dict[str, Any],
+) -> List[Tuple[int, Dict[str, list], List[str]]]:
+    """
+    Run process_peak for a bucket of nearby peaks.
+    
+    group holds (index, peak, secondary_bounds, ridge_bounds) entries; their
+    hard-negative search windows are read as one tile and sliced per peak.
+    Returns (index, cols, warnings) per peak.
+    """
+    windows = []
+    for _, _, secondary_bounds, ridge_bounds in group:
+        for bounds in (secondary_bounds, ridge_bounds):
+            if bounds is not None:
+                window = search_window(ds, bounds)
+                if window is not None:
+                    windows.append(window)
+    
+    try:
+        tile = read_search_tile(ds, windows)
+    except Exception:
+        tile = None
+    
+    results = []
+    for i, peak, secondary_bounds, ridge_bounds in group:
+        cols, warnings = process_peak(
+            ds, to_native, from_native, peak, **options,
+            secondary_bounds=secondary_bounds, ridge_bounds=ridge_bounds, tile=tile,
+        )
+        results.append((i, cols, warnings))
+    return results
+
+
+# Per-process DEM handle for pool workers, opened once by _init_worker
+_worker_dem: Dict[str, Any] = {}
+
+
+def _init_worker(dem_path: str) -> None:
+    ds = open_dem(dem_path)
+    _worker_dem["ds"] = ds
+    _worker_dem["transformers"] = dem_transformers(ds)
+
+
+def _process_group_in_worker(
+    task: Tuple[List[Tuple[int, Dict[str, Any], Any, Any]], Dict[str, Any]],
+) -> List[Tuple[int, Dict[str, list], List[str]]]:
+    to_native, from_native = _worker_dem["transformers"]
+    return process_peak_group(_worker_dem["ds"], to_native, from_native, *task)
+
+
+def _bounded_map(executor, fn, tasks: List[Any], ahead: int) -> Iterator[Any]:
+    """Like executor.map, but with at most `ahead` tasks submitted past the one being yielded."""
+    task_iter = iter(tasks)
+    futures = deque(executor.submit(fn, task) for task in itertools.islice(task_iter, ahead + 1))
+    while futures:
+        result = futures.popleft().result()
+        for task in itertools.islice(task_iter, 1):
+            futures.append(executor.submit(fn, task))
+        yield result
+
+
+def iter_training_samples(
     peaks: List[Dict[str, Any]],
     dem_path: str,
     negatives_per_positive: int = 4,
     feature_radius_m: float = 50.0,
     include_hard_negatives: bool = True,
     verbose: bool = True,
-) -> pd.DataFrame:
+    seed: int = 42,
+    workers: Optional[int] = None,
+) -> Iterator[Dict[str, list]]:
     """
-    Generate training dataset with features.
+    Yield each peak's sample columns (see new_columns), one bucket at a time.
     
     For each verified peak (positive), generates multiple negative samples
     and extracts features for all points.
@@ -326,149 +761,160 @@ def generate_training_data(
     If include_hard_negatives=True, also adds:
     - Secondary peaks (nearby local maxima that aren't the true summit)
     - Ridge points (high points with asymmetric gradients)
-    """
-    rows = []
-    feature_names = get_feature_names()
     
+    Peaks are grouped into TILE_BUCKET_DEG buckets that share one DEM read
+    for their hard-negative searches, and buckets are spread over `workers`
+    processes (default: all CPUs; 1 runs in-process). Random negatives are seeded per
+    peak from `seed`, so output does not depend on the worker count.
+    
+    Buckets are yielded in order of their first peak in the input, and peaks
+    in input order within a bucket; rows carry peak_id and label, so this
+    order has no meaning of its own. At most BUCKETS_IN_FLIGHT_PER_WORKER
+    buckets per worker are submitted ahead of the one being yielded, which
+    bounds how many finished buckets are held in memory.
+    """
     total_peaks = len(peaks)
     total_secondary = 0
     total_ridge = 0
     
-    for i, peak in enumerate(peaks):
-        peak_id = peak["id"]
-        peak_name = peak["name"]
-        lat = peak["lat"]
-        lon = peak["lon"]
-        seed_lat = peak.get("seed_lat", lat)
-        seed_lon = peak.get("seed_lon", lon)
-        
-        if verbose:
-            print(f"[{i+1}/{total_peaks}] Processing {peak_name}...")
-        
-        # === Positive sample (the actual summit) ===
-        pos_features = extract_features(
-            dem_path, lat, lon, feature_radius_m, seed_lat, seed_lon
-        )
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    with rasterio.open(dem_path) as ds:
+        to_native, from_native = dem_transformers(ds)
         
-        if "error" in pos_features:
-            if verbose:
-                print(f"  WARNING: Error extracting positive features: {pos_features['error']}")
-            continue
+        # Project every peak's hard-negative search boxes up front
+        secondary_bounds = [None] * total_peaks
+        ridge_bounds = [None] * total_peaks
+        if include_hard_negatives and peaks:
+            peak_lats = np.array([p["lat"] for p in peaks], dtype=np.float64)
+            peak_lons = np.array([p["lon"] for p in peaks], dtype=np.float64)
+            secondary_bounds = native_bounds(to_native, peak_lats, peak_lons, 150.0)
+            ridge_bounds = native_bounds(to_native, peak_lats, peak_lons, 100.0)
         
-        pos_row = {
-            "peak_id": peak_id,
-            "peak_name": peak_name,
-            "sample_type": "positive",
-            "lat": lat,
-            "lon": lon,
-            "label": 1,
+        # Bucket nearby peaks so each bucket's search windows share one read
+        options = {
+            "negatives_per_positive": negatives_per_positive,
+            "feature_radius_m": feature_radius_m,
+            "include_hard_negatives": include_hard_negatives,
+            "seed": seed,
         }
-        for fname in feature_names:
-            pos_row[fname] = pos_features[fname]
-        rows.append(pos_row)
-        
-        # === Hard negatives: Secondary peaks ===
-        if include_hard_negatives:
-            try:
-                secondary_peaks = find_secondary_peaks(dem_path, lat, lon, radius_m=150.0)
-                for sec_lat, sec_lon, sec_elev in secondary_peaks[:2]:  # Max 2 per peak
-                    sec_features = extract_features(
-                        dem_path, sec_lat, sec_lon, feature_radius_m, seed_lat, seed_lon
-                    )
-                    if "error" not in sec_features:
-                        sec_row = {
-                            "peak_id": peak_id,
-                            "peak_name": peak_name,
-                            "sample_type": "secondary_peak",
-                            "lat": sec_lat,
-                            "lon": sec_lon,
-                            "label": 0,
-                        }
-                        for fname in feature_names:
-                            sec_row[fname] = sec_features[fname]
-                        rows.append(sec_row)
-                        total_secondary += 1
-            except Exception as e:
-                if verbose:
-                    print(f"  WARNING: Error finding secondary peaks: {e}")
-        
-        # === Hard negatives: Ridge points ===
-        if include_hard_negatives:
-            try:
-                ridge_points = find_ridge_points(dem_path, lat, lon, radius_m=100.0, num_points=2)
-                for ridge_lat, ridge_lon in ridge_points:
-                    ridge_features = extract_features(
-                        dem_path, ridge_lat, ridge_lon, feature_radius_m, seed_lat, seed_lon
-                    )
-                    if "error" not in ridge_features:
-                        ridge_row = {
-                            "peak_id": peak_id,
-                            "peak_name": peak_name,
-                            "sample_type": "ridge",
-                            "lat": ridge_lat,
-                            "lon": ridge_lon,
-                            "label": 0,
-                        }
-                        for fname in feature_names:
-                            ridge_row[fname] = ridge_features[fname]
-                        rows.append(ridge_row)
-                        total_ridge += 1
-            except Exception as e:
-                if verbose:
-                    print(f"  WARNING: Error finding ridge points: {e}")
-        
-        # === Random negatives (easier cases) ===
-        neg_count = 0
-        attempts = 0
-        # Reduce random negatives if we have hard negatives
-        random_negatives_target = negatives_per_positive - 2 if include_hard_negatives else negatives_per_positive
-        max_attempts = random_negatives_target * 3
+        buckets: Dict[Tuple[int, int], List[Tuple[int, Dict[str, Any], Any, Any]]] = {}
+        for i, peak in enumerate(peaks):
+            key = (
+                math.floor(peak["lat"] / TILE_BUCKET_DEG),
+                math.floor(peak["lon"] / TILE_BUCKET_DEG),
+            )
+            buckets.setdefault(key, []).append((i, peak, secondary_bounds[i], ridge_bounds[i]))
+        tasks = [(group, options) for group in buckets.values()]
         
-        while neg_count < random_negatives_target and attempts < max_attempts:
-            attempts += 1
-            
-            neg_lat, neg_lon = generate_negative_sample(lat, lon)
-            
-            neg_features = extract_features(
-                dem_path, neg_lat, neg_lon, feature_radius_m, seed_lat, seed_lon
+        if workers > 1 and len(tasks) > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)), initializer=_init_worker, initargs=(dem_path,)
+            )
+            results = _bounded_map(
+                executor, _process_group_in_worker, tasks, workers * BUCKETS_IN_FLIGHT_PER_WORKER
             )
-            
-            if "error" in neg_features:
-                continue  # Skip invalid points
-            
-            # Skip if this point is actually very high (might be another summit)
-            if neg_features["elev_rank"] > 0.95 and neg_features["pct_lower"] > 0.9:
-                continue  # Too summit-like, skip
-            
-            neg_row = {
-                "peak_id": peak_id,
-                "peak_name": peak_name,
-                "sample_type": "random",
-                "lat": neg_lat,
-                "lon": neg_lon,
-                "label": 0,
-            }
-            for fname in feature_names:
-                neg_row[fname] = neg_features[fname]
-            rows.append(neg_row)
-            neg_count += 1
+        else:
+            executor = None
+            results = (process_peak_group(ds, to_native, from_native, *task) for task in tasks)
         
-        if verbose and neg_count < random_negatives_target:
-            print(f"  WARNING: Only generated {neg_count}/{random_negatives_target} random negatives")
+        try:
+            for group_results in results:
+                for i, peak_cols, warnings in group_results:
+                    if verbose:
+                        print(f"[{i+1}/{total_peaks}] Processed {peaks[i]['name']}")
+                        for warning in warnings:
+                            print(warning)
+                    total_secondary += peak_cols["sample_type"].count("secondary_peak")
+                    total_ridge += peak_cols["sample_type"].count("ridge")
+                    yield peak_cols
+        finally:
+            if executor is not None:
+                executor.shutdown()
     
     if verbose and include_hard_negatives:
         print(f"\nHard negatives added:")
         print(f"  Secondary peaks: {total_secondary}")
         print(f"  Ridge points: {total_ridge}")
+
+
+def generate_training_data(
+    peaks: List[Dict[str, Any]],
+    dem_path: str,
+    negatives_per_positive: int = 4,
+    feature_radius_m: float = 50.0,
+    include_hard_negatives: bool = True,
+    verbose: bool = True,
+    seed: int = 42,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Generate training dataset with features as one DataFrame.
     
-    df = pd.DataFrame(rows)
-    return df
+    See iter_training_samples for how samples are generated; use
+    write_training_csv to stream them to disk instead.
+    """
+    parts = list(iter_training_samples(
+        peaks,
+        dem_path,
+        negatives_per_positive=negatives_per_positive,
+        feature_radius_m=feature_radius_m,
+        include_hard_negatives=include_hard_negatives,
+        verbose=verbose,
+        seed=seed,
+        workers=workers,
+    ))
+    return columns_to_frame(parts)
+
+
+def write_training_csv(
+    parts: Iterable[Dict[str, list]],
+    path: str,
+    flush_peaks: int = CSV_FLUSH_PEAKS,
+) -> Tuple[int, int, Dict[str, int]]:
+    """
+    Stream per-peak sample columns to a CSV file.
+    
+    Peaks are buffered flush_peaks at a time and appended with to_csv, so
+    the file matches a single df.to_csv without holding every sample.
+    Returns (total samples, positive samples, counts per sample_type).
+    """
+    total = 0
+    positives = 0
+    type_counts: Dict[str, int] = {}
+    
+    with open(path, "w", newline="") as f:
+        header = True
+        batch: List[Dict[str, list]] = []
+        
+        def flush() -> None:
+            nonlocal header
+            columns_to_frame(batch).to_csv(f, header=header, index=False)
+            header = False
+            batch.clear()
+        
+        for part in parts:
+            total += len(part["label"])
+            positives += sum(part["label"])
+            for stype in part["sample_type"]:
+                type_counts[stype] = type_counts.get(stype, 0) + 1
+            batch.append(part)
+            if len(batch) >= flush_peaks:
+                flush()
+        if batch or header:
+            flush()
+    
+    return total, positives, type_counts
 
 
 def main():
     parser = argparse.ArgumentParser(description="Generate ML training data for summit detection")
     parser.add_argument("--dem-path", required=True, help="Path to DEM file (GeoTIFF or VRT)")
-    parser.add_argument("--output", default="training_data.csv", help="Output CSV path")
+    parser.add_argument("--output", default="training_data.csv",
+                        help="Output path (.csv, or .parquet for Parquet)")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None,
+                        help="Output format (default: from --output extension)")
     parser.add_argument("--min-elevation-14er", type=float, default=4267.0, 
                         help="Minimum elevation (m) for 14ers (default: 4267)")
     parser.add_argument("--max-snap-distance-13er", type=float, default=8.0,
@@ -478,14 +924,19 @@ def main():
     parser.add_argument("--feature-radius", type=float, default=50.0,
                         help="Radius (m) for feature extraction (default: 50)")
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for per-peak extraction (default: CPU count)")
     parser.add_argument("--quiet", action="store_true", help="Suppress verbose output")
     parser.add_argument("--no-hard-negatives", action="store_true", 
                         help="Disable hard negatives (secondary peaks, ridge points)")
     
     args = parser.parse_args()
     
-    random.seed(args.seed)
-    np.random.seed(args.seed)
+    # Check up front so a missing pyarrow doesn't surface after extraction
+    output_format = args.format or output_format_for(args.output)
+    if output_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        sys.stderr.write("Error: pyarrow is required for Parquet output. Install with: pip install pyarrow\n")
+        sys.exit(1)
     
     print("=" * 60)
     print("GENERATE ML TRAINING DATA FOR SUMMIT DETECTION")
@@ -529,39 +980,48 @@ def main():
     print("Generating training data...")
     print("-" * 60)
     
-    df = generate_training_data(
-        peaks,
-        args.dem_path,
-        negatives_per_positive=args.negatives_per_positive,
-        feature_radius_m=args.feature_radius,
-        include_hard_negatives=include_hard_negatives,
-        verbose=not args.quiet,
-    )
+    options = {
+        "negatives_per_positive": args.negatives_per_positive,
+        "feature_radius_m": args.feature_radius,
+        "include_hard_negatives": include_hard_negatives,
+        "verbose": not args.quiet,
+        "seed": args.seed,
+        "workers": args.workers,
+    }
     
-    # Save to CSV
-    print("-" * 60)
-    print(f"Saving to {args.output}...")
-    df.to_csv(args.output, index=False)
+    if output_format == "parquet":
+        df = generate_training_data(peaks, args.dem_path, **options)
+        print("-" * 60)
+        print(f"Saving to {args.output}...")
+        write_parquet(df, args.output)
+        total = len(df)
+        positives = int((df['label'] == 1).sum())
+        type_counts = df['sample_type'].value_counts(sort=False).to_dict()
+    else:
+        # Stream CSV rows to disk as peaks finish
+        print(f"Streaming to {args.output}...")
+        total, positives, type_counts = write_training_csv(
+            iter_training_samples(peaks, args.dem_path, **options), args.output
+        )
+        print("-" * 60)
     
     # Summary
     print()
     print("=" * 60)
     print("SUMMARY")
     print("=" * 60)
-    print(f"Total samples: {len(df)}")
-    print(f"  - Positive (summits): {(df['label'] == 1).sum()}")
-    print(f"  - Negative (non-summits): {(df['label'] == 0).sum()}")
+    print(f"Total samples: {total}")
+    print(f"  - Positive (summits): {positives}")
+    print(f"  - Negative (non-summits): {total - positives}")
     
     # Breakdown by sample type
-    if 'sample_type' in df.columns:
-        print("\nSample type breakdown:")
-        for stype in df['sample_type'].unique():
-            count = (df['sample_type'] == stype).sum()
-            print(f"  - {stype}: {count}")
+    print("\nSample type breakdown:")
+    for stype, count in type_counts.items():
+        print(f"  - {stype}: {count}")
     
     print()
-    print(f"Features: {len(get_feature_names())}")
-    for fname in get_feature_names():
+    print(f"Features: {len(FEATURE_NAMES)}")
+    for fname in FEATURE_NAMES:
         print(f"  - {fname}")
     print()
     print(f"Output saved to: {args.output}")
@@ -4,7 +4,12 @@ ML-based summit detection for peak snapping.
 
 Reads JSONL from stdin with peak_id, lat, lon, radius_m.
 Generates candidate points, extracts features, scores with ML model.
-Outputs JSONL with best candidate per peak.
+Outputs JSONL with best candidate per peak, in input order.
+
+Records are read and scored in spatially sorted batches of
+SPATIAL_SORT_BATCH (spread over worker processes with --workers > 1), so
+output is written and flushed a batch at a time rather than one line per
+input record.
 
 Usage:
     echo '{"peak_id":"123","lat":39.1,"lon":-106.4,"radius_m":100}' | \
@@ -15,22 +20,114 @@ import sys
 import json
 import math
 import argparse
-from typing import Dict, Any, List, Optional, Tuple
+import importlib.util
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 import numpy as np
 import rasterio
 import joblib
-from pyproj import Transformer
 from rasterio.windows import from_bounds
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from extract_features import (
     extract_features,
+    extract_features_at_cells,
     get_feature_names,
-    features_to_vector,
-    haversine_m,
+    features_to_vector_into,
+    haversine_m_vec,
+    open_dem,
     deg_window_from_radius,
+    dem_transformers,
 )
 
+# GDAL block cache (MB) for the CLI's JSONL loop
+GDAL_CACHEMAX_MB = 512
+
+# JSONL records per pool task (and model call) when the CLI runs with
+# several workers
+PREDICT_CHUNK_SIZE = 64
+
+# Records are read and scored in spatial order in batches of this many (one
+# model call per batch when serial, PREDICT_CHUNK_SIZE chunks when pooled);
+# bucket size in degrees
+SPATIAL_SORT_BATCH = 1024
+SPATIAL_BUCKET_DEG = 0.1
+
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def dump_jsonl(obj: Dict[str, Any]) -> str:
+        # Feature values may still be numpy scalars
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY).decode()
+else:
+    json_loads = json.loads
+
+    def dump_jsonl(obj: Dict[str, Any]) -> str:
+        return json.dumps(obj) + "\n"
+
+
+def is_onnx_model(model_path: str) -> bool:
+    """ONNX exports (train_summit_model.py --onnx-output) are chosen by extension."""
+    return model_path.lower().endswith(".onnx")
+
+
+@lru_cache(maxsize=4)
+def load_model(model_path: str) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Load a trained model once per path; predict_summit runs once per JSONL record.
+    
+    Returns a function mapping a float32 feature matrix to P(summit) per
+    row. .onnx models run on onnxruntime (optional dependency); anything
+    else is a joblib-saved sklearn model.
+    
+    Each call scores one JSONL batch or chunk (see predict_items), where
+    dispatching trees to a thread pool (the training-time n_jobs=-1) costs
+    more than it saves and oversubscribes CLI worker processes, so both
+    backends predict single-threaded.
+    """
+    if is_onnx_model(model_path):
+        import onnxruntime
+        
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+        session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        input_name = session.get_inputs()[0].name
+        proba_name = session.get_outputs()[1].name  # (label, probabilities)
+        
+        def predict_positive(feature_matrix: np.ndarray) -> np.ndarray:
+            return session.run([proba_name], {input_name: feature_matrix})[0][:, 1]
+        
+        return predict_positive
+    
+    model = joblib.load(model_path)
+    if hasattr(model, "n_jobs"):
+        model.n_jobs = 1
+    
+    def predict_positive(feature_matrix: np.ndarray) -> np.ndarray:
+        return model.predict_proba(feature_matrix)[:, 1]
+    
+    return predict_positive
+
+
+def _read_window(ds, window) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read one DEM window as a plain float32 array plus a boolean validity mask.
+    
+    Everything downstream indexes these two arrays directly instead of
+    going through MaskedArray operations.
+    """
+    arr = ds.read(1, window=window, masked=True, out_dtype=np.float32)
+    return arr.data, ~np.ma.getmaskarray(arr)
+
 
 def generate_candidate_grid(
     lat: float,
@@ -43,27 +140,19 @@ def generate_candidate_grid(
     
     Returns list of (lat, lon) tuples.
     """
-    candidates = []
-    
     lat_per_m = 1.0 / 111320.0
     lon_per_m = 1.0 / (111320.0 * math.cos(math.radians(lat)))
     
     steps = int(radius_m / step_m)
     
-    for i in range(-steps, steps + 1):
-        for j in range(-steps, steps + 1):
-            dlat = i * step_m * lat_per_m
-            dlon = j * step_m * lon_per_m
-            
-            cand_lat = lat + dlat
-            cand_lon = lon + dlon
-            
-            # Check distance from center
-            dist = haversine_m(lat, lon, cand_lat, cand_lon)
-            if dist <= radius_m:
-                candidates.append((cand_lat, cand_lon))
+    # The grid is laid out in local meters, so keep cells by planar distance
+    # and only convert the kept offsets to lat/lon
+    dy, dx = np.mgrid[-steps:steps + 1, -steps:steps + 1] * step_m
+    inside = dy * dy + dx * dx <= radius_m * radius_m
+    cand_lats = lat + dy[inside] * lat_per_m
+    cand_lons = lon + dx[inside] * lon_per_m
     
-    return candidates
+    return list(zip(cand_lats.tolist(), cand_lons.tolist()))
 
 
 def find_top_elevation_candidates(
@@ -87,92 +176,43 @@ def find_top_elevation_candidates(
     """
     # Support both path (string) and already-open dataset
     if isinstance(dem_path_or_ds, str):
-        ds = rasterio.open(dem_path_or_ds)
-        should_close = True
+        ds = open_dem(dem_path_or_ds)
     else:
         ds = dem_path_or_ds
-        should_close = False
+    
+    to_native, from_native = dem_transformers(ds)
+    
+    # Get bounding box
+    min_lon, min_lat, max_lon, max_lat = deg_window_from_radius(lat, lon, radius_m)
+    
+    if to_native:
+        min_x, min_y = to_native.transform(min_lon, min_lat)
+        max_x, max_y = to_native.transform(max_lon, max_lat)
+    else:
+        min_x, min_y = min_lon, min_lat
+        max_x, max_y = max_lon, max_lat
     
     try:
-        crs = ds.crs
-        to_native = None
-        from_native = None
-        
-        if crs and not crs.is_geographic:
-            to_native = Transformer.from_crs("EPSG:4326", crs, always_xy=True)
-            from_native = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
-        
-        # Get bounding box
-        min_lon, min_lat, max_lon, max_lat = deg_window_from_radius(lat, lon, radius_m)
-        
-        if to_native:
-            min_x, min_y = to_native.transform(min_lon, min_lat)
-            max_x, max_y = to_native.transform(max_lon, max_lat)
-        else:
-            min_x, min_y = min_lon, min_lat
-            max_x, max_y = max_lon, max_lat
-        
-        try:
-            window = from_bounds(min_x, min_y, max_x, max_y, ds.transform)
-            window = window.intersection(rasterio.windows.Window(0, 0, ds.width, ds.height))
-        except Exception:
-            return []
-        
-        if window.width < 3 or window.height < 3:
-            return []
-        
-        arr = ds.read(1, window=window, masked=True)
-        
-        if arr.count() == 0:
-            return []
-        
-        win_transform = ds.window_transform(window)
-        
-        # Flatten and get indices sorted by elevation (descending)
-        flat = arr.flatten()
-        valid_indices = ~flat.mask if hasattr(flat, 'mask') else np.ones(len(flat), dtype=bool)
-        
-        # Get indices of valid cells sorted by elevation descending
-        valid_flat_indices = np.where(valid_indices)[0]
-        sorted_indices = valid_flat_indices[np.argsort(-flat[valid_flat_indices])]
-        
-        candidates = []
-        
-        for flat_idx in sorted_indices:
-            if len(candidates) >= top_n:
-                break
-            
-            # Convert flat index to row, col
-            r, c = np.unravel_index(flat_idx, arr.shape)
-            elev = float(arr[r, c])
-            
-            # Convert to geographic coords
-            x, y = win_transform * (c + 0.5, r + 0.5)
-            
-            if from_native:
-                cand_lon, cand_lat = from_native.transform(x, y)
-            else:
-                cand_lon, cand_lat = x, y
-            
-            # Check if within radius
-            dist_from_center = haversine_m(lat, lon, cand_lat, cand_lon)
-            if dist_from_center > radius_m:
-                continue
-            
-            # Check separation from existing candidates
-            too_close = False
-            for existing_lat, existing_lon, _ in candidates:
-                if haversine_m(cand_lat, cand_lon, existing_lat, existing_lon) < min_separation_m:
-                    too_close = True
-                    break
-            
-            if not too_close:
-                candidates.append((cand_lat, cand_lon, elev))
-        
-        return candidates
-    finally:
-        if should_close:
-            ds.close()
+        window = from_bounds(min_x, min_y, max_x, max_y, ds.transform)
+        window = window.intersection(rasterio.windows.Window(0, 0, ds.width, ds.height))
+    except Exception:
+        return []
+    
+    if window.width < 3 or window.height < 3:
+        return []
+    
+    data, valid = _read_window(ds, window)
+    
+    if not valid.any():
+        return []
+    
+    win_transform = ds.window_transform(window)
+    
+    candidates, _ = _find_candidates_from_array(
+        data, valid, win_transform, from_native, lat, lon, radius_m,
+        top_n=top_n, min_separation_m=min_separation_m,
+    )
+    return candidates
 
 
 # Keep old function name as alias for compatibility
@@ -187,6 +227,136 @@ def find_local_maxima(
     return find_top_elevation_candidates(dem_path_or_ds, lat, lon, radius_m, top_n=15, min_separation_m=5.0)
 
 
+def _collect_features(
+    peak: Dict[str, Any],
+    candidates: List[Tuple[float, float, float]],
+    cells: np.ndarray,
+    feature_radius_m: float,
+    seed_lat: float,
+    seed_lon: float,
+    feature_buffer: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """
+    Extract features for (lat, lon, elevation) candidates centered on their
+    (row, col) cells of a peak's in-memory window (see _read_peak).
+    Candidates whose features can't be extracted are dropped.
+    
+    Returns parallel columns: "lat", "lon", "elevation_m" and
+    "distance_from_seed_m" arrays, a "features" list, and the float32
+    "feature_matrix" to score (rows of feature_buffer, if given; a float32
+    (len(candidates), F) scratch matrix whose contents are overwritten).
+    """
+    extracted = []
+    if feature_buffer is None:
+        feature_buffer = np.empty((len(candidates), len(get_feature_names())), dtype=np.float32)
+    master_data = peak["master_data"]
+    master_valid = peak["master_valid"]
+    cell_size_m = peak["cell_size_m"]
+    
+    # Features for every candidate at once, then keep those that succeeded
+    lats = np.array([c[0] for c in candidates], dtype=np.float64)
+    lons = np.array([c[1] for c in candidates], dtype=np.float64)
+    all_features = extract_features_at_cells(
+        master_data, master_valid, cells[:, 0], cells[:, 1],
+        np.full(len(candidates), cell_size_m), feature_radius_m,
+        lats, lons, seed_lat, seed_lon,
+    )
+    
+    for (cand_lat, cand_lon, cand_elev), features in zip(candidates, all_features):
+        # Write the vector straight into the next free buffer row
+        if not features_to_vector_into(features, feature_buffer[len(extracted)]):
+            continue
+        
+        extracted.append((cand_lat, cand_lon, cand_elev, features))
+    
+    scored_lats = np.array([e[0] for e in extracted], dtype=np.float64)
+    scored_lons = np.array([e[1] for e in extracted], dtype=np.float64)
+    
+    return {
+        "lat": scored_lats,
+        "lon": scored_lons,
+        "elevation_m": np.array([e[2] for e in extracted], dtype=np.float64),
+        # Distance from the seed for every candidate in one pass
+        "distance_from_seed_m": haversine_m_vec(seed_lat, seed_lon, scored_lats, scored_lons),
+        "features": [e[3] for e in extracted],
+        "feature_matrix": feature_buffer[:len(extracted)],
+    }
+
+
+def score_feature_matrix(
+    predict_positive: Callable[[np.ndarray], np.ndarray],
+    feature_matrix: np.ndarray,
+) -> np.ndarray:
+    """
+    Score a float32 feature matrix with one model call (see load_model).
+    NaN/Inf features are zeroed in place; every row scores 0.0 if the
+    model call fails.
+    """
+    np.nan_to_num(feature_matrix, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    
+    probas = np.zeros(len(feature_matrix))
+    if len(feature_matrix) > 0:
+        try:
+            probas = predict_positive(feature_matrix)
+        except Exception:
+            pass
+    return np.asarray(probas, dtype=np.float64)
+
+
+def _score_candidates(
+    predict_positive: Callable[[np.ndarray], np.ndarray],
+    peak: Dict[str, Any],
+    candidates: List[Tuple[float, float, float]],
+    cells: np.ndarray,
+    feature_radius_m: float,
+    seed_lat: float,
+    seed_lon: float,
+    feature_buffer: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """
+    Extract features for candidates and score them with one model call.
+    
+    Returns the scored candidates as parallel columns: "lat", "lon",
+    "elevation_m", "ml_probability" and "distance_from_seed_m" arrays plus
+    a "features" list (see SCORED_COLUMNS and concat_scored).
+    """
+    scored = _collect_features(peak, candidates, cells, feature_radius_m, seed_lat, seed_lon, feature_buffer)
+    scored["ml_probability"] = score_feature_matrix(predict_positive, scored.pop("feature_matrix"))
+    return scored
+
+
+# Array columns of a scored-candidate batch (see _score_candidates)
+SCORED_COLUMNS = ["lat", "lon", "elevation_m", "ml_probability", "distance_from_seed_m"]
+
+
+def concat_scored(batches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate scored-candidate batches (an empty list gives empty columns)."""
+    scored = {
+        name: np.concatenate([b[name] for b in batches]) if batches else np.empty(0, dtype=np.float64)
+        for name in SCORED_COLUMNS
+    }
+    scored["features"] = [f for b in batches for f in b["features"]]
+    return scored
+
+
+def scored_candidate(scored: Dict[str, Any], i: int) -> Dict[str, Any]:
+    """Build the output dict for scored candidate i."""
+    return {
+        "lat": float(scored["lat"][i]),
+        "lon": float(scored["lon"][i]),
+        "elevation_m": float(scored["elevation_m"][i]),
+        "ml_probability": float(scored["ml_probability"][i]),
+        "distance_from_seed_m": float(scored["distance_from_seed_m"][i]),
+        "features": scored["features"][i],
+    }
+
+
+def _best_index(primary: np.ndarray, secondary: np.ndarray) -> int:
+    """Index of the largest `primary`, ties broken by the largest `secondary` (then first)."""
+    tied = np.flatnonzero(primary == primary.max())
+    return int(tied[np.argmax(secondary[tied])])
+
+
 def predict_summit(
     dem_path: str,
     model_path: str,
@@ -198,26 +368,37 @@ def predict_summit(
     top_k: int = 5,
     feature_radius_m: float = 50.0,
     max_candidates_to_score: int = 15,  # Only score top N by elevation
+    early_stop_probability: Optional[float] = None,
+    early_stop_drop_m: float = 20.0,
+    early_stop_min_scored: int = 3,
 ) -> Dict[str, Any]:
     """
     Use ML model to find the best summit candidate.
     
     Args:
         dem_path: Path to DEM file
-        model_path: Path to trained model (.joblib)
+        model_path: Path to trained model (.joblib, or .onnx for onnxruntime)
         lat, lon: Seed coordinates
         radius_m: Search radius
         seed_lat, seed_lon: Original seed coords (for dist_to_seed feature)
         top_k: Return top K candidates in output
         feature_radius_m: Radius for feature extraction
         max_candidates_to_score: Only extract features for top N candidates by elevation
+        early_stop_probability: If set, stop scoring lower candidates once the
+            best candidate reaches this probability and the next unscored one
+            is more than early_stop_drop_m below it (default: score all)
+        early_stop_drop_m: Elevation margin for early stopping (0 stops as soon
+            as a confident candidate outranks the next one by elevation)
+        early_stop_min_scored: With early stopping, score this many of the
+            highest candidates first, so an easy peak can stop after one
+            small batch
     
     Returns:
         Dictionary with best candidate and alternatives
     """
-    # Load model
+    # Load model (cached across calls)
     try:
-        model = joblib.load(model_path)
+        predict_positive = load_model(model_path)
     except Exception as e:
         return {"error": f"model_load_failed: {e}"}
     
@@ -227,6 +408,62 @@ def predict_summit(
     if seed_lon is None:
         seed_lon = lon
     
+    peak = _read_peak(dem_path, lat, lon, radius_m, feature_radius_m, max_candidates_to_score)
+    if "error" in peak:
+        return peak
+    candidates = peak["candidates"]
+    total_candidates_found = len(candidates)
+    
+    # Score candidates in descending-elevation batches. With early stopping,
+    # the first batch is the early_stop_min_scored highest candidates, and
+    # scoring stops once the most likely summit so far is confident and
+    # stands more than early_stop_drop_m above every candidate still unscored.
+    if early_stop_probability is None:
+        bounds = [0, total_candidates_found]
+    else:
+        batch_size = 2 * top_k + 8
+        first = min(max(1, early_stop_min_scored), total_candidates_found)
+        bounds = [0] + list(range(first, total_candidates_found, batch_size)) + [total_candidates_found]
+    
+    # One feature matrix for the peak; each batch fills its own rows
+    feature_buffer = np.empty((total_candidates_found, len(get_feature_names())), dtype=np.float32)
+    batches = []
+    for start, next_start in zip(bounds[:-1], bounds[1:]):
+        batches.append(_score_candidates(
+            predict_positive, peak, candidates[start:next_start], peak["candidate_cells"][start:next_start],
+            feature_radius_m, seed_lat, seed_lon,
+            feature_buffer=feature_buffer[start:next_start],
+        ))
+        
+        if early_stop_probability is None or next_start >= total_candidates_found:
+            continue
+        scored = concat_scored(batches)
+        if len(scored["features"]) == 0:
+            continue
+        leader_idx = _best_index(scored["ml_probability"], scored["elevation_m"])
+        if (scored["ml_probability"][leader_idx] >= early_stop_probability
+                and candidates[next_start][2] < scored["elevation_m"][leader_idx] - early_stop_drop_m):
+            break
+    
+    return summarize_scored(concat_scored(batches), total_candidates_found, top_k)
+
+
+def _read_peak(
+    dem_path: str,
+    lat: float,
+    lon: float,
+    radius_m: float,
+    feature_radius_m: float,
+    max_candidates_to_score: int,
+) -> Dict[str, Any]:
+    """
+    Read the DEM window around a seed and find its candidates (highest
+    first).
+    
+    Returns {"error": ...} or the peak's in-memory context: "candidates",
+    their "candidate_cells" in master_data (see _find_candidates_from_array),
+    "master_data", "master_valid" and "cell_size_m".
+    """
     # =========================================================================
     # CRITICAL OPTIMIZATION: Read DEM into memory ONCE
     # =========================================================================
@@ -236,114 +473,99 @@ def predict_summit(
     # So we read search_radius + feature_radius to cover all cases
     total_radius = radius_m + feature_radius_m
     
-    with rasterio.open(dem_path) as ds:
-        crs = ds.crs
-        to_native = None
-        from_native = None
-        
-        if crs and not crs.is_geographic:
-            to_native = Transformer.from_crs("EPSG:4326", crs, always_xy=True)
-            from_native = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
-        
-        # Get bounding box for the full area we need
-        min_lon, min_lat, max_lon, max_lat = deg_window_from_radius(lat, lon, total_radius)
-        
-        if to_native:
-            min_x, min_y = to_native.transform(min_lon, min_lat)
-            max_x, max_y = to_native.transform(max_lon, max_lat)
-            center_x, center_y = to_native.transform(lon, lat)
-        else:
-            min_x, min_y = min_lon, min_lat
-            max_x, max_y = max_lon, max_lat
-            center_x, center_y = lon, lat
-        
-        try:
-            window = from_bounds(min_x, min_y, max_x, max_y, ds.transform)
-            window = window.intersection(rasterio.windows.Window(0, 0, ds.width, ds.height))
-        except Exception:
-            return {"error": "window_error"}
-        
-        if window.width < 3 or window.height < 3:
-            return {"error": "window_too_small"}
-        
-        # READ ONCE - this is the only disk I/O!
-        master_arr = ds.read(1, window=window, masked=True)
-        master_transform = ds.window_transform(window)
-        
-        if master_arr.count() == 0:
-            return {"error": "no_data"}
-        
-        # Get cell size for feature calculations
-        if crs and not crs.is_geographic:
-            cell_size_m = abs(master_transform.a)
-        else:
-            cell_size_m = abs(master_transform.a) * 111320 * math.cos(math.radians(lat))
+    ds = open_dem(dem_path)
+    to_native, from_native = dem_transformers(ds)
+    
+    # Get bounding box for the full area we need
+    min_lon, min_lat, max_lon, max_lat = deg_window_from_radius(lat, lon, total_radius)
+    
+    if to_native:
+        min_x, min_y = to_native.transform(min_lon, min_lat)
+        max_x, max_y = to_native.transform(max_lon, max_lat)
+    else:
+        min_x, min_y = min_lon, min_lat
+        max_x, max_y = max_lon, max_lat
+    
+    try:
+        window = from_bounds(min_x, min_y, max_x, max_y, ds.transform)
+        window = window.intersection(rasterio.windows.Window(0, 0, ds.width, ds.height))
+    except Exception:
+        return {"error": "window_error"}
+    
+    if window.width < 3 or window.height < 3:
+        return {"error": "window_too_small"}
+    
+    # READ ONCE - this is the only disk I/O!
+    master_data, master_valid = _read_window(ds, window)
+    master_transform = ds.window_transform(window)
+    
+    if not master_valid.any():
+        return {"error": "no_data"}
+    
+    # Get cell size for feature calculations
+    if to_native:
+        cell_size_m = abs(master_transform.a)
+    else:
+        cell_size_m = abs(master_transform.a) * 111320 * math.cos(math.radians(lat))
     
     # =========================================================================
-    # From here on, ALL operations use the in-memory master_arr
+    # From here on, ALL operations use the in-memory master_data/master_valid
     # =========================================================================
     
     # Find top candidates from in-memory array
-    candidates = _find_candidates_from_array(
-        master_arr, master_transform, from_native,
-        lat, lon, radius_m, center_x, center_y,
+    candidates, candidate_cells = _find_candidates_from_array(
+        master_data, master_valid, master_transform, from_native,
+        lat, lon, radius_m,
         top_n=max_candidates_to_score, min_separation_m=5.0
     )
     
     if not candidates:
         return {"error": "no_candidates"}
     
-    total_candidates_found = len(candidates)
-    
-    # Extract features and score candidates - all from in-memory array
-    feature_names = get_feature_names()
-    scored_candidates = []
-    
-    for cand_lat, cand_lon, cand_elev in candidates:
-        # Extract features from in-memory array
-        features = _extract_features_from_array(
-            master_arr, master_transform, from_native, to_native,
-            cand_lat, cand_lon, feature_radius_m, cell_size_m,
-            seed_lat, seed_lon
-        )
-        
-        if features is None:
-            continue
-        
-        # Get feature vector
-        feature_vec = [features.get(name, 0.0) for name in feature_names]
-        
-        # Handle NaN/Inf
-        feature_vec = [0.0 if (np.isnan(v) or np.isinf(v)) else v for v in feature_vec]
-        
-        # Predict probability
-        try:
-            proba = model.predict_proba([feature_vec])[0][1]
-        except Exception:
-            proba = 0.0
-        
-        dist_from_seed = haversine_m(seed_lat, seed_lon, cand_lat, cand_lon)
-        
-        scored_candidates.append({
-            "lat": cand_lat,
-            "lon": cand_lon,
-            "elevation_m": cand_elev,
-            "ml_probability": float(proba),
-            "distance_from_seed_m": dist_from_seed,
-            "features": features,
-        })
-    
-    if not scored_candidates:
+    return {
+        "candidates": candidates,
+        "candidate_cells": candidate_cells,
+        "master_data": master_data,
+        "master_valid": master_valid,
+        "cell_size_m": cell_size_m,
+    }
+
+
+def summarize_scored(scored: Dict[str, Any], total_candidates_found: int, top_k: int) -> Dict[str, Any]:
+    """Build predict_summit's result from a peak's scored candidates."""
+    n = len(scored["features"])
+    if n == 0:
         return {"error": "no_valid_candidates"}
     
-    # Sort by ML probability (descending), then by elevation (descending)
-    scored_candidates.sort(key=lambda c: (-c["ml_probability"], -c["elevation_m"]))
+    probs = scored["ml_probability"]
+    elevs = scored["elevation_m"]
     
-    # Select best candidate
-    best = scored_candidates[0]
-    
-    # Also find the highest-elevation candidate for comparison
-    highest_elev_candidate = max(scored_candidates, key=lambda c: c["elevation_m"])
+    # Top K by ML probability (descending), then by elevation (descending);
+    # partition down to the candidates tied with or above the K-th probability
+    # and only sort those
+    k = max(0, min(top_k, n))
+    if 0 < k < n:
+        kth_prob = np.partition(probs, n - k)[n - k]
+        subset = np.flatnonzero(probs >= kth_prob)
+    else:
+        subset = np.arange(n)
+    top_order = subset[np.lexsort((subset, -elevs[subset], -probs[subset]))][:k]
+    
+    # Select best candidate (ties on probability go to the higher one)
+    best_idx = _best_index(probs, elevs)
+    best = scored_candidate(scored, best_idx)
+    
+    # Also find the highest-elevation candidate for comparison (reported
+    # without features, so its output dict is only built when it differs)
+    highest_idx = _best_index(elevs, probs)
+    highest_elev_candidate = None
+    if highest_idx != best_idx:
+        highest_elev_candidate = {
+            "lat": float(scored["lat"][highest_idx]),
+            "lon": float(scored["lon"][highest_idx]),
+            "elevation_m": float(elevs[highest_idx]),
+            "ml_probability": float(probs[highest_idx]),
+        }
     
     return {
         "snapped_lat": best["lat"],
@@ -352,203 +574,128 @@ def predict_summit(
         "ml_probability": best["ml_probability"],
         "snapped_distance_m": best["distance_from_seed_m"],
         "candidates_found": total_candidates_found,
-        "candidates_evaluated": len(scored_candidates),
-        "top_candidates": scored_candidates[:top_k],
-        "highest_elev_candidate": {
-            "lat": highest_elev_candidate["lat"],
-            "lon": highest_elev_candidate["lon"],
-            "elevation_m": highest_elev_candidate["elevation_m"],
-            "ml_probability": highest_elev_candidate["ml_probability"],
-        } if highest_elev_candidate != best else None,
+        "candidates_evaluated": n,
+        "top_candidates": [scored_candidate(scored, i) for i in top_order],
+        "highest_elev_candidate": highest_elev_candidate,
     }
 
 
+def _iter_by_elevation(flat_data: np.ndarray, indices: np.ndarray, block_size: int):
+    """
+    Yield `indices` in blocks of block_size, highest elevation first (ties in
+    raster order).
+    
+    Cells are selected in rounds with argpartition: the first round takes the
+    highest block_size cells (plus ties), and each later round takes four
+    times as many of the cells left. Only the selected cells are sorted, so
+    a caller that stops early never sorts the whole window.
+    """
+    neg_elevs = -flat_data[indices]
+    remaining = np.arange(len(indices))
+    round_size = block_size
+    
+    while len(remaining) > 0:
+        if round_size < len(remaining):
+            remaining_elevs = neg_elevs[remaining]
+            kth = remaining_elevs[np.argpartition(remaining_elevs, round_size - 1)[round_size - 1]]
+            selected = remaining_elevs <= kth
+            head = remaining[selected]
+            remaining = remaining[~selected]
+        else:
+            head = remaining
+            remaining = remaining[:0]
+        
+        head = head[np.argsort(neg_elevs[head], kind="stable")]
+        for start in range(0, len(head), block_size):
+            yield indices[head[start:start + block_size]]
+        round_size *= 4
+
+
 def _find_candidates_from_array(
-    arr: np.ma.MaskedArray,
+    data: np.ndarray,
+    valid: np.ndarray,
     transform,
     from_native,
     center_lat: float,
     center_lon: float,
     radius_m: float,
-    center_x: float,
-    center_y: float,
     top_n: int = 15,
     min_separation_m: float = 5.0,
-) -> List[Tuple[float, float, float]]:
-    """Find top N highest elevation candidates from an in-memory array."""
+) -> Tuple[List[Tuple[float, float, float]], np.ndarray]:
+    """
+    Find top N highest elevation candidates from an in-memory array.
     
-    # Flatten and sort by elevation
-    flat = arr.flatten()
-    valid_indices = ~flat.mask if hasattr(flat, 'mask') else np.ones(len(flat), dtype=bool)
-    valid_flat_indices = np.where(valid_indices)[0]
+    Returns the (lat, lon, elevation) candidates and their (row, col) cells
+    in `data` as an (n, 2) int array, so callers can index the same array
+    without projecting the candidates back.
     
-    if len(valid_flat_indices) == 0:
-        return []
+    Cells are visited as integer (row, col) pixel indices in descending
+    elevation order; each pixel is visited once, so only the radius and
+    separation checks are needed before accepting it. Pixels are projected
+    to lat/lon in blocks with one Transformer call per block, and separation
+    is tested against all accepted candidates at once in local meters.
+    """
     
-    sorted_indices = valid_flat_indices[np.argsort(-flat[valid_flat_indices])]
+    # Valid cells as flat indices into the (unmasked) elevation buffer
+    flat_data = data.ravel()
+    valid_flat_indices = np.flatnonzero(valid)
+    
+    if len(valid_flat_indices) == 0:
+        return [], np.empty((0, 2), dtype=np.intp)
     
     candidates = []
+    cells = []
+    block_size = max(4 * top_n, 64)
     
-    for flat_idx in sorted_indices:
+    # Separation is checked on local planar offsets (m) from the center on
+    # haversine_m's sphere, which match it at search-radius scale
+    m_per_deg_lat = math.radians(6371000)
+    m_per_deg_lon = m_per_deg_lat * math.cos(math.radians(center_lat))
+    min_sep_sq = min_separation_m * min_separation_m
+    accepted = np.empty((max(top_n, 0), 2), dtype=np.float64)
+    
+    for block in _iter_by_elevation(flat_data, valid_flat_indices, block_size):
         if len(candidates) >= top_n:
             break
         
-        r, c = np.unravel_index(flat_idx, arr.shape)
-        elev = float(arr[r, c])
+        rows, cols = np.unravel_index(block, data.shape)
         
         # Convert to geographic coords
-        x, y = transform * (c + 0.5, r + 0.5)
+        xs, ys = transform * (cols + 0.5, rows + 0.5)
         
         if from_native:
-            cand_lon, cand_lat = from_native.transform(x, y)
+            cand_lons, cand_lats = from_native.transform(xs, ys)
         else:
-            cand_lon, cand_lat = x, y
-        
-        # Check if within search radius
-        dist_from_center = haversine_m(center_lat, center_lon, cand_lat, cand_lon)
-        if dist_from_center > radius_m:
-            continue
-        
-        # Check separation from existing candidates
-        too_close = False
-        for existing_lat, existing_lon, _ in candidates:
-            if haversine_m(cand_lat, cand_lon, existing_lat, existing_lon) < min_separation_m:
-                too_close = True
+            cand_lons, cand_lats = xs, ys
+        
+        # Drop pixels outside the search radius
+        inside = haversine_m_vec(center_lat, center_lon, cand_lats, cand_lons) <= radius_m
+        cand_lats, cand_lons = cand_lats[inside], cand_lons[inside]
+        rows, cols = rows[inside], cols[inside]
+        elevs = flat_data[block][inside]
+        offsets = np.column_stack((
+            (cand_lons - center_lon) * m_per_deg_lon,
+            (cand_lats - center_lat) * m_per_deg_lat,
+        ))
+        
+        for offset, cand_lat, cand_lon, elev, row, col in zip(
+            offsets, cand_lats.tolist(), cand_lons.tolist(), elevs.tolist(), rows.tolist(), cols.tolist(),
+        ):
+            n = len(candidates)
+            if n >= top_n:
                 break
-        
-        if not too_close:
+            
+            # Check separation from existing candidates
+            if n > 0:
+                diff = accepted[:n] - offset
+                if (diff * diff).sum(axis=1).min() < min_sep_sq:
+                    continue
+            
+            accepted[n] = offset
             candidates.append((cand_lat, cand_lon, elev))
+            cells.append((row, col))
     
-    return candidates
-
-
-def _extract_features_from_array(
-    master_arr: np.ma.MaskedArray,
-    master_transform,
-    from_native,
-    to_native,
-    lat: float,
-    lon: float,
-    radius_m: float,
-    cell_size_m: float,
-    seed_lat: float,
-    seed_lon: float,
-) -> Optional[Dict[str, float]]:
-    """Extract ML features from an in-memory array (no disk I/O)."""
-    
-    # Convert lat/lon to array coordinates
-    if to_native:
-        x, y = to_native.transform(lon, lat)
-    else:
-        x, y = lon, lat
-    
-    inv_transform = ~master_transform
-    col, row = inv_transform * (x, y)
-    center_row, center_col = int(round(row)), int(round(col))
-    
-    # Compute window size in cells
-    cells_radius = int(math.ceil(radius_m / cell_size_m))
-    
-    # Get bounds for this feature window within the master array
-    r_min = max(0, center_row - cells_radius)
-    r_max = min(master_arr.shape[0], center_row + cells_radius + 1)
-    c_min = max(0, center_col - cells_radius)
-    c_max = min(master_arr.shape[1], center_col + cells_radius + 1)
-    
-    if r_max - r_min < 3 or c_max - c_min < 3:
-        return None
-    
-    # Extract sub-array (this is just numpy slicing, instant)
-    arr = master_arr[r_min:r_max, c_min:c_max]
-    
-    # Adjust center position relative to sub-array
-    local_row = center_row - r_min
-    local_col = center_col - c_min
-    
-    # Clamp to bounds
-    local_row = max(0, min(arr.shape[0] - 1, local_row))
-    local_col = max(0, min(arr.shape[1] - 1, local_col))
-    
-    center_elev = arr[local_row, local_col]
-    if np.ma.is_masked(center_elev):
-        return None
-    
-    center_elev = float(center_elev)
-    valid_elevs = arr.compressed()
-    
-    if len(valid_elevs) == 0:
-        return None
-    
-    # === Compute features ===
-    
-    # 1. Elevation rank
-    elev_rank = float(np.sum(valid_elevs <= center_elev)) / len(valid_elevs)
-    
-    # 2. Directional gradients
-    distance_cells = max(1, int(round(radius_m / 5 / cell_size_m)))
-    gradients = {}
-    directions = {
-        "N": (-1, 0), "S": (1, 0), "E": (0, 1), "W": (0, -1),
-        "NE": (-1, 1), "SE": (1, 1), "SW": (1, -1), "NW": (-1, -1),
-    }
-    
-    for name, (dr, dc) in directions.items():
-        tr = local_row + dr * distance_cells
-        tc = local_col + dc * distance_cells
-        if 0 <= tr < arr.shape[0] and 0 <= tc < arr.shape[1]:
-            target_elev = arr[tr, tc]
-            if not np.ma.is_masked(target_elev):
-                gradients[name] = float(center_elev - target_elev)
-            else:
-                gradients[name] = 0.0
-        else:
-            gradients[name] = 0.0
-    
-    min_gradient = min(gradients.values())
-    mean_gradient = sum(gradients.values()) / len(gradients)
-    grad_variance = float(np.var(list(gradients.values())))
-    
-    # 3. Local relief
-    local_relief = float(valid_elevs.max() - valid_elevs.min())
-    
-    # 4. Percent lower
-    pct_lower = float(np.sum(valid_elevs < center_elev)) / len(valid_elevs)
-    
-    # 5. Curvature (Laplacian)
-    curvature = 0.0
-    if 1 <= local_row < arr.shape[0] - 1 and 1 <= local_col < arr.shape[1] - 1:
-        neighbors = [
-            arr[local_row - 1, local_col],
-            arr[local_row + 1, local_col],
-            arr[local_row, local_col - 1],
-            arr[local_row, local_col + 1],
-        ]
-        if not any(np.ma.is_masked(n) for n in neighbors):
-            laplacian = (sum(float(n) for n in neighbors) - 4 * center_elev) / (cell_size_m ** 2)
-            curvature = -laplacian  # Positive = convex summit
-    
-    # 6. Distance to seed
-    dist_to_seed = haversine_m(lat, lon, seed_lat, seed_lon)
-    
-    return {
-        "elevation": center_elev,
-        "elev_rank": elev_rank,
-        "gradient_N": gradients["N"],
-        "gradient_S": gradients["S"],
-        "gradient_E": gradients["E"],
-        "gradient_W": gradients["W"],
-        "gradient_NE": gradients["NE"],
-        "gradient_SE": gradients["SE"],
-        "gradient_SW": gradients["SW"],
-        "gradient_NW": gradients["NW"],
-        "min_gradient": min_gradient,
-        "mean_gradient": mean_gradient,
-        "grad_variance": grad_variance,
-        "local_relief": local_relief,
-        "pct_lower": pct_lower,
-        "curvature": curvature,
-        "dist_to_seed": dist_to_seed,
-    }
+    return candidates, np.array(cells, dtype=np.intp).reshape(-1, 2)
 
 
 def iter_jsonl(stream):
@@ -557,47 +704,229 @@ def iter_jsonl(stream):
         line = line.strip()
         if line:
             try:
-                yield json.loads(line)
+                yield json_loads(line)
             except json.JSONDecodeError:
                 continue
 
 
+def _item_args(item: Dict[str, Any]) -> Tuple[Any, Any, Any, float, Any, Any]:
+    """(peak_id, lat, lon, radius_m, seed_lat, seed_lon) of a JSONL input record."""
+    lat = item.get("lat")
+    lon = item.get("lon")
+    return (
+        item.get("peak_id", "unknown"),
+        lat,
+        lon,
+        item.get("radius_m", 100.0),
+        item.get("seed_lat", lat),
+        item.get("seed_lon", lon),
+    )
+
+
+def predict_item(item: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run predict_summit for one JSONL input record; options carry the CLI settings."""
+    peak_id, lat, lon, radius_m, seed_lat, seed_lon = _item_args(item)
+    
+    if lat is None or lon is None:
+        return {"peak_id": peak_id, "error": "missing_coords"}
+    
+    result = predict_summit(
+        options["dem_path"],
+        options["model_path"],
+        lat,
+        lon,
+        radius_m,
+        seed_lat,
+        seed_lon,
+        top_k=options["top_k"],
+        feature_radius_m=options["feature_radius_m"],
+        max_candidates_to_score=options["max_candidates_to_score"],
+        early_stop_probability=options["early_stop_probability"],
+        early_stop_drop_m=options["early_stop_drop_m"],
+        early_stop_min_scored=options["early_stop_min_scored"],
+    )
+    result["peak_id"] = peak_id
+    return result
+
+
+def predict_items(items: List[Dict[str, Any]], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    predict_item over several records (in order), scoring every candidate of
+    every record with one model call instead of one call per record.
+    
+    Each record's DEM window is released once its features are extracted,
+    so only the feature rows are held across the batch. Early stopping
+    decides per peak whether to score more, so with it set (or if the model
+    fails to load) records go through predict_item one at a time.
+    """
+    if options["early_stop_probability"] is not None:
+        return [predict_item(item, options) for item in items]
+    try:
+        predict_positive = load_model(options["model_path"])
+    except Exception:
+        # predict_item reports the load failure on every record
+        return [predict_item(item, options) for item in items]
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    collected = []  # (record index, peak_id, unscored candidate columns, candidates found)
+    
+    # Every record writes its feature rows straight into one C-order float32
+    # matrix (no per-record arrays to concatenate); n_rows are filled
+    feature_matrix = np.empty(
+        (len(items) * max(0, options["max_candidates_to_score"]), len(get_feature_names())), dtype=np.float32
+    )
+    n_rows = 0
+    for i, item in enumerate(items):
+        peak_id, lat, lon, radius_m, seed_lat, seed_lon = _item_args(item)
+        if lat is None or lon is None:
+            results[i] = {"peak_id": peak_id, "error": "missing_coords"}
+            continue
+        
+        peak = _read_peak(
+            options["dem_path"], lat, lon, radius_m,
+            options["feature_radius_m"], options["max_candidates_to_score"],
+        )
+        if "error" in peak:
+            peak["peak_id"] = peak_id
+            results[i] = peak
+            continue
+        
+        columns = _collect_features(
+            peak, peak["candidates"], peak["candidate_cells"], options["feature_radius_m"],
+            lat if seed_lat is None else seed_lat,
+            lon if seed_lon is None else seed_lon,
+            feature_buffer=feature_matrix[n_rows:n_rows + len(peak["candidates"])],
+        )
+        del columns["feature_matrix"]
+        n_rows += len(columns["features"])
+        collected.append((i, peak_id, columns, len(peak["candidates"])))
+    
+    # Score all records' candidates at once, then split the probabilities
+    # back by record
+    if collected:
+        probas = score_feature_matrix(predict_positive, feature_matrix[:n_rows])
+        start = 0
+        for i, peak_id, columns, total_candidates_found in collected:
+            end = start + len(columns["features"])
+            columns["ml_probability"] = probas[start:end]
+            start = end
+            
+            result = summarize_scored(columns, total_candidates_found, options["top_k"])
+            result["peak_id"] = peak_id
+            results[i] = result
+    
+    return results
+
+
+def _morton_code(row: int, col: int) -> int:
+    """Interleave the bits of non-negative (row, col) into a Z-order curve index."""
+    code = 0
+    for bit in range(max(row, col).bit_length()):
+        code |= ((col >> bit) & 1) << (2 * bit)
+        code |= ((row >> bit) & 1) << (2 * bit + 1)
+    return code
+
+
+def spatial_order(items: List[Dict[str, Any]]) -> List[int]:
+    """
+    Indices of `items` ordered by SPATIAL_BUCKET_DEG tile along a Z-order
+    (Morton) curve from the north-west, so consecutive peaks, and the
+    PREDICT_CHUNK_SIZE chunks cut from this order, cover compact areas and
+    reuse GDAL's cached DEM blocks. Records without coordinates go last.
+    """
+    def key(i: int) -> Tuple[int, int]:
+        lat = items[i].get("lat")
+        lon = items[i].get("lon")
+        if lat is None or lon is None:
+            return (1, 0)
+        row = max(0, math.floor((90.0 - lat) / SPATIAL_BUCKET_DEG))
+        col = max(0, math.floor((lon + 180.0) / SPATIAL_BUCKET_DEG))
+        return (0, _morton_code(row, col))
+    
+    return sorted(range(len(items)), key=key)
+
+
+def _predict_chunk(task: Tuple[List[Dict[str, Any]], Dict[str, Any]]) -> List[str]:
+    """Pool worker: score a chunk of records, returning JSON lines in order."""
+    items, options = task
+    with rasterio.Env(GDAL_CACHEMAX=GDAL_CACHEMAX_MB):
+        return [dump_jsonl(result) for result in predict_items(items, options)]
+
+
 def main():
     parser = argparse.ArgumentParser(description="ML-based summit detection")
     parser.add_argument("--dem-path", required=True, help="Path to DEM file (GeoTIFF or VRT)")
-    parser.add_argument("--model-path", required=True, help="Path to trained model (.joblib)")
+    parser.add_argument("--model-path", required=True,
+                        help="Path to trained model (.joblib, or an .onnx export scored with onnxruntime)")
     parser.add_argument("--feature-radius", type=float, default=50.0, help="Feature extraction radius (m)")
     parser.add_argument("--top-k", type=int, default=5, help="Number of top candidates to return")
     parser.add_argument("--max-candidates", type=int, default=15, help="Max candidates to score (top N by elevation)")
+    parser.add_argument("--early-stop-prob", type=float, default=None,
+                        help="Stop scoring lower candidates once the best reaches this probability "
+                             "and the rest are --early-stop-drop m below it (default: score all)")
+    parser.add_argument("--early-stop-drop", type=float, default=20.0,
+                        help="Elevation margin (m) for --early-stop-prob (default: 20)")
+    parser.add_argument("--early-stop-min-scored", type=int, default=3,
+                        help="Highest candidates scored before --early-stop-prob can stop (default: 3)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (default: 1). Each worker opens the DEM and loads "
+                             "the model itself, so this only pays off for large inputs")
     
     args = parser.parse_args()
     
-    for item in iter_jsonl(sys.stdin):
-        peak_id = item.get("peak_id", "unknown")
-        lat = item.get("lat")
-        lon = item.get("lon")
-        radius_m = item.get("radius_m", 100.0)
-        seed_lat = item.get("seed_lat", lat)
-        seed_lon = item.get("seed_lon", lon)
-        
-        if lat is None or lon is None:
-            result = {"peak_id": peak_id, "error": "missing_coords"}
-        else:
-            result = predict_summit(
-                args.dem_path,
-                args.model_path,
-                lat,
-                lon,
-                radius_m,
-                seed_lat,
-                seed_lon,
-                top_k=args.top_k,
-                feature_radius_m=args.feature_radius,
-                max_candidates_to_score=args.max_candidates,
-            )
-            result["peak_id"] = peak_id
-        
-        print(json.dumps(result), flush=True)
+    # Check up front so a missing onnxruntime doesn't fail every record
+    if is_onnx_model(args.model_path) and importlib.util.find_spec("onnxruntime") is None:
+        sys.stderr.write("Error: onnxruntime is required for .onnx models. Install with: pip install onnxruntime\n")
+        sys.exit(1)
+    
+    options = {
+        "dem_path": args.dem_path,
+        "model_path": args.model_path,
+        "top_k": args.top_k,
+        "feature_radius_m": args.feature_radius,
+        "max_candidates_to_score": args.max_candidates,
+        "early_stop_probability": args.early_stop_prob,
+        "early_stop_drop_m": args.early_stop_drop,
+        "early_stop_min_scored": args.early_stop_min_scored,
+    }
+    records_in = iter_jsonl(sys.stdin)
+    batches = iter(lambda: list(itertools.islice(records_in, SPATIAL_SORT_BATCH)), [])
+    
+    # Input that fits in one chunk gains nothing from a pool
+    first = next(batches, [])
+    batches = itertools.chain([first], batches)
+    
+    if args.workers > 1 and len(first) > PREDICT_CHUNK_SIZE:
+        # Peaks are independent: each batch is cut into PREDICT_CHUNK_SIZE
+        # chunks along its spatial order and scored in worker processes
+        # (each with its own DEM handle and model), then written back in
+        # input order before the next batch is read
+        max_workers = min(args.workers, math.ceil(SPATIAL_SORT_BATCH / PREDICT_CHUNK_SIZE))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for batch in batches:
+                order = spatial_order(batch)
+                chunks = [order[i:i + PREDICT_CHUNK_SIZE] for i in range(0, len(order), PREDICT_CHUNK_SIZE)]
+                lines: List[Optional[str]] = [None] * len(batch)
+                tasks = [([batch[i] for i in chunk], options) for chunk in chunks]
+                for chunk, chunk_lines in zip(chunks, executor.map(_predict_chunk, tasks)):
+                    for i, line in zip(chunk, chunk_lines):
+                        lines[i] = line
+                sys.stdout.writelines(lines)
+                sys.stdout.flush()
+        return
+    
+    # One DEM handle serves every input line, so give GDAL a block cache
+    # large enough to keep overlapping windows of clustered peaks; each
+    # batch is read in spatial order, scored with one model call (see
+    # predict_items) and written in input order
+    with rasterio.Env(GDAL_CACHEMAX=GDAL_CACHEMAX_MB):
+        for batch in batches:
+            order = spatial_order(batch)
+            results: List[Optional[Dict[str, Any]]] = [None] * len(batch)
+            for i, result in zip(order, predict_items([batch[i] for i in order], options)):
+                results[i] = result
+            sys.stdout.writelines(dump_jsonl(result) for result in results)
+            sys.stdout.flush()
 
 
 if __name__ == "__main__":
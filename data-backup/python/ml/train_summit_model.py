@@ -10,8 +10,10 @@ Usage:
 """
 
 import argparse
+import importlib.util
 import json
 import os
+import sys
 from typing import Dict, Any, List, Tuple
 
 import numpy as np
@@ -33,18 +35,31 @@ from extract_features import get_feature_names
 
 def load_training_data(csv_path: str) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame]:
     """
-    Load training data from CSV.
+    Load training data from CSV (or Parquet, by .parquet/.pq extension).
+    
+    Only the feature and label columns are read, features as float32 and
+    labels as int8; CSVs are parsed with pyarrow when it is installed.
     
     Returns:
-        X: Feature matrix (n_samples, n_features)
+        X: float32 feature matrix (n_samples, n_features)
         y: Labels (n_samples,)
-        df: Original DataFrame for reference
+        df: The loaded feature and label columns
     """
-    df = pd.read_csv(csv_path)
-    
     feature_names = get_feature_names()
-    X = df[feature_names].values
-    y = df["label"].values
+    columns = feature_names + ["label"]
+    dtypes = {name: np.float32 for name in feature_names}
+    dtypes["label"] = np.int8
+    
+    if csv_path.lower().endswith((".parquet", ".pq")):
+        df = pd.read_parquet(csv_path, columns=columns).astype(dtypes)
+    else:
+        try:
+            df = pd.read_csv(csv_path, usecols=columns, dtype=dtypes, engine="pyarrow")
+        except ImportError:
+            df = pd.read_csv(csv_path, usecols=columns, dtype=dtypes)
+    
+    X = df[feature_names].to_numpy(dtype=np.float32, copy=False)
+    y = df["label"].to_numpy(dtype=np.int8)
     
     return X, y, df
 
@@ -171,16 +186,43 @@ def train_and_evaluate(
     return model, cv_results
 
 
+def export_onnx(model: RandomForestClassifier, path: str) -> None:
+    """
+    Export the trained model to ONNX for predict_summit.py's onnxruntime path.
+    
+    Probabilities are emitted as a plain (n, 2) float tensor (no ZipMap),
+    taking float32 input with one column per get_feature_names() entry.
+    Requires skl2onnx.
+    """
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    
+    onx = convert_sklearn(
+        model,
+        initial_types=[("X", FloatTensorType([None, len(get_feature_names())]))],
+        options={id(model): {"zipmap": False}},
+    )
+    with open(path, "wb") as f:
+        f.write(onx.SerializeToString())
+
+
 def main():
     parser = argparse.ArgumentParser(description="Train ML model for summit detection")
-    parser.add_argument("--input", required=True, help="Path to training_data.csv")
+    parser.add_argument("--input", required=True, help="Path to training_data.csv (or .parquet)")
     parser.add_argument("--output", default="models/summit_model.joblib", help="Output model path")
     parser.add_argument("--metrics-output", default=None, help="Output JSON for metrics")
     parser.add_argument("--n-folds", type=int, default=5, help="Number of CV folds (default: 5)")
     parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--onnx-output", default=None,
+                        help="Also export the model to this .onnx path (requires skl2onnx)")
     
     args = parser.parse_args()
     
+    # Check up front so a missing skl2onnx doesn't surface after training
+    if args.onnx_output and importlib.util.find_spec("skl2onnx") is None:
+        sys.stderr.write("Error: skl2onnx is required for --onnx-output. Install with: pip install skl2onnx\n")
+        sys.exit(1)
+    
     print("=" * 60)
     print("TRAIN SUMMIT DETECTION MODEL")
     print("=" * 60)
@@ -199,7 +241,7 @@ def main():
     print(f"  - Features: {X.shape[1]}")
     
     # Check for NaN/inf
-    if np.any(np.isnan(X)) or np.any(np.isinf(X)):
+    if not np.isfinite(X).all():
         print("\nWARNING: Found NaN/Inf values in features!")
         nan_cols = np.any(np.isnan(X), axis=0)
         inf_cols = np.any(np.isinf(X), axis=0)
@@ -221,6 +263,11 @@ def main():
     print(f"\n{'='*60}")
     print(f"Model saved to: {args.output}")
     
+    if args.onnx_output:
+        os.makedirs(os.path.dirname(args.onnx_output) or ".", exist_ok=True)
+        export_onnx(model, args.onnx_output)
+        print(f"ONNX model saved to: {args.onnx_output}")
+    
     # Save metrics
     if args.metrics_output:
         with open(args.metrics_output, "w") as f:
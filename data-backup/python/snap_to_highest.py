@@ -6,6 +6,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import rasterio
+from rasterio.enums import Resampling
 from pyproj import Transformer
 from scipy.ndimage import maximum_filter, gaussian_filter
 
@@ -20,6 +21,17 @@ def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return 2.0 * r * math.asin(math.sqrt(a))
 
 
+def haversine_m_vec(lat0: float, lon0: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    # Array form of haversine_m: distances from one point to many.
+    r = 6371000.0
+    phi1 = math.radians(lat0)
+    phi2 = np.radians(lats)
+    dphi = np.radians(lats - lat0)
+    dl = np.radians(lons - lon0)
+    a = np.sin(dphi / 2.0) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dl / 2.0) ** 2
+    return 2.0 * r * np.arcsin(np.sqrt(a))
+
+
 def deg_window_from_radius(lat: float, radius_m: float) -> Tuple[float, float]:
     # Approx conversions; good enough for <= few km windows.
     deg_lat = radius_m / 111320.0
@@ -43,13 +55,11 @@ def find_local_maxima_scipy(
 ) -> np.ndarray:
     """
     Find local maxima using scipy's maximum_filter.
-    """
-    work_arr = arr.copy()
-    
-    if np.ma.is_masked(work_arr):
-        work_arr = work_arr.filled(np.nan)
     
-    work_arr[~valid_mask] = -np.inf
+    Invalid cells are set to -inf while building the working copy, so the
+    single maximum_filter pass never selects them.
+    """
+    work_arr = np.where(valid_mask, np.ma.getdata(arr), -np.inf)
     
     if gaussian_sigma > 0:
         smoothed = gaussian_filter(np.where(valid_mask, work_arr, 0), sigma=gaussian_sigma)
@@ -181,6 +191,53 @@ def compute_summit_confidence(
     return combined, radial_score, neighborhood_score
 
 
+def refine_at_native_resolution(
+    ds: rasterio.io.DatasetReader,
+    cand: Dict[str, Any],
+    lat: float,
+    lon: float,
+    window: rasterio.windows.Window,
+    scale_x: float,
+    scale_y: float,
+    to_wgs84: Optional[Transformer],
+    from_wgs84: Optional[Transformer],
+) -> None:
+    """
+    Move a candidate found on a downsampled read to the highest native pixel
+    within one coarse cell of it (inside the search window), updating its
+    coordinates, elevation and seed distance in place.
+    """
+    if ds.crs.is_geographic:
+        x, y = cand["snapped_lon"], cand["snapped_lat"]
+    else:
+        x, y = from_wgs84.transform(cand["snapped_lon"], cand["snapped_lat"])
+    col_f, row_f = ~ds.transform * (x, y)
+    
+    c0 = max(int(window.col_off), math.floor(col_f - 1.5 * scale_x))
+    c1 = min(int(window.col_off + window.width), math.ceil(col_f + 1.5 * scale_x))
+    r0 = max(int(window.row_off), math.floor(row_f - 1.5 * scale_y))
+    r1 = min(int(window.row_off + window.height), math.ceil(row_f + 1.5 * scale_y))
+    if r1 <= r0 or c1 <= c0:
+        return
+    
+    sub = ds.read(1, window=rasterio.windows.Window.from_slices((r0, r1), (c0, c1)),
+                  masked=True, out_dtype=np.float32)
+    if np.ma.getmaskarray(sub).all():
+        return
+    
+    r, c = np.unravel_index(int(np.ma.argmax(sub)), sub.shape)
+    x, y = ds.transform * (c0 + c + 0.5, r0 + r + 0.5)
+    if ds.crs.is_geographic:
+        new_lon, new_lat = x, y
+    else:
+        new_lon, new_lat = to_wgs84.transform(x, y)
+    
+    cand["snapped_lat"] = float(new_lat)
+    cand["snapped_lon"] = float(new_lon)
+    cand["elevation_m"] = float(sub[r, c])
+    cand["snapped_distance_m"] = haversine_m(lat, lon, new_lat, new_lon)
+
+
 def snap_one_top_k(
     ds: rasterio.io.DatasetReader,
     lon: float,
@@ -197,10 +254,18 @@ def snap_one_top_k(
     compute_confidence: bool = True,
     confidence_radial_m: float = 20.0,
     confidence_neighborhood_m: float = 30.0,
+    max_read_px: int = 0,
 ) -> List[Dict[str, Any]]:
     """
     Find the top K highest points within radius_m of (lat, lon), 
     with summit confidence scoring.
+    
+    If max_read_px > 0 and the search window is wider than that many
+    pixels, it is read downsampled so GDAL can serve it from the DEM's
+    overviews (build them with `gdaladdo -r max` so summit elevations
+    survive); pixel-based settings then apply to the coarser grid. Each
+    candidate considered for the top K is then refined to the highest
+    native pixel around it (see refine_at_native_resolution).
     """
     if ds.crs is None:
         raise RuntimeError("DEM dataset has no CRS")
@@ -242,7 +307,21 @@ def snap_one_top_k(
         return []
 
     window = rasterio.windows.Window.from_slices((row0, row1 + 1), (col0, col1 + 1))
-    arr = ds.read(1, window=window, masked=True)
+    
+    # Native pixels per read pixel along each axis (1 = native resolution)
+    scale = 1
+    if max_read_px > 0:
+        scale = max(1, math.ceil(max(window.width, window.height) / max_read_px))
+    if scale > 1:
+        out_shape = (math.ceil(window.height / scale), math.ceil(window.width / scale))
+        arr = ds.read(1, window=window, masked=True, out_dtype=np.float32,
+                      out_shape=out_shape, resampling=Resampling.nearest)
+        scale_y = window.height / out_shape[0]
+        scale_x = window.width / out_shape[1]
+        pixel_size_m *= scale_x
+    else:
+        arr = ds.read(1, window=window, masked=True, out_dtype=np.float32)
+        scale_y = scale_x = 1.0
     if arr.size == 0:
         return []
 
@@ -269,25 +348,23 @@ def snap_one_top_k(
     radial_pixels = max(1, int(confidence_radial_m / pixel_size_m))
     neighborhood_pixels = max(1, int(confidence_neighborhood_m / pixel_size_m))
     
+    # Coordinates, elevations and seed distances for every candidate at once
+    r_offs, c_offs = candidate_indices
+    xs, ys = ds.transform * (col0 + (c_offs + 0.5) * scale_x, row0 + (r_offs + 0.5) * scale_y)
+    if ds.crs.is_geographic:
+        cand_lons, cand_lats = xs, ys
+    else:
+        if to_wgs84 is None:
+            raise RuntimeError("Missing to_wgs84 transformer for projected dataset")
+        cand_lons, cand_lats = to_wgs84.transform(xs, ys)
+    elevs = np.ma.getdata(arr)[r_offs, c_offs].astype(np.float64)
+    dists = haversine_m_vec(lat, lon, cand_lats, cand_lons)
+    
     candidates_data = []
-    for r_off, c_off in zip(candidate_indices[0], candidate_indices[1]):
-        r = int(row0 + r_off)
-        c = int(col0 + c_off)
-        
-        x, y = ds.xy(r, c)
-        if ds.crs.is_geographic:
-            cand_lon = float(x)
-            cand_lat = float(y)
-        else:
-            if to_wgs84 is None:
-                raise RuntimeError("Missing to_wgs84 transformer for projected dataset")
-            cand_lon, cand_lat = to_wgs84.transform(x, y)
-            cand_lon = float(cand_lon)
-            cand_lat = float(cand_lat)
-        
-        elev = float(arr[r_off, c_off])
-        dist_from_seed = haversine_m(lat, lon, cand_lat, cand_lon)
-        
+    for r_off, c_off, cand_lat, cand_lon, elev, dist_from_seed in zip(
+        r_offs.tolist(), c_offs.tolist(), cand_lats.tolist(), cand_lons.tolist(),
+        elevs.tolist(), dists.tolist(),
+    ):
         # Compute confidence scores
         if compute_confidence:
             confidence, radial_score, neighborhood_score = compute_summit_confidence(
@@ -319,23 +396,30 @@ def snap_one_top_k(
     else:
         candidates_data.sort(key=lambda c: (-c["confidence"], -c["elevation_m"]))
     
-    # Select top K with minimum separation
+    # Select top K with minimum separation, checking each candidate against
+    # every selected one in a single vectorized pass
     selected: List[Dict[str, Any]] = []
+    sel_lats = np.empty(max(top_k, 0), dtype=np.float64)
+    sel_lons = np.empty(max(top_k, 0), dtype=np.float64)
     
     for cand in candidates_data:
-        if len(selected) >= top_k:
+        n = len(selected)
+        if n >= top_k:
             break
         
-        too_close = False
-        for existing in selected:
-            sep = haversine_m(cand["snapped_lat"], cand["snapped_lon"], 
-                            existing["snapped_lat"], existing["snapped_lon"])
-            if sep < min_separation_m:
-                too_close = True
-                break
+        if scale > 1:
+            refine_at_native_resolution(
+                ds, cand, lat, lon, window, scale_x, scale_y, to_wgs84, from_wgs84
+            )
+        
+        if n > 0:
+            seps = haversine_m_vec(cand["snapped_lat"], cand["snapped_lon"], sel_lats[:n], sel_lons[:n])
+            if seps.min() < min_separation_m:
+                continue
         
-        if not too_close:
-            selected.append(cand)
+        sel_lats[n] = cand["snapped_lat"]
+        sel_lons[n] = cand["snapped_lon"]
+        selected.append(cand)
     
     return selected
 
@@ -368,6 +452,9 @@ def main() -> int:
                        help="Distance in meters for radial dominance check")
     parser.add_argument("--confidence-neighborhood-m", type=float, default=30.0,
                        help="Radius in meters for neighborhood dominance check")
+    parser.add_argument("--max-read-px", type=int, default=0,
+                       help="Read search windows wider than this many pixels downsampled "
+                            "(served from DEM overviews if present); 0 = native resolution")
     args = parser.parse_args()
     
     default_require_local_max = not args.no_require_local_max
@@ -382,6 +469,15 @@ def main() -> int:
             to_wgs84 = Transformer.from_crs(ds.crs, "EPSG:4326", always_xy=True)
             from_wgs84 = Transformer.from_crs("EPSG:4326", ds.crs, always_xy=True)
 
+        # Without overviews, a downsampled read is plain decimation that can
+        # skip summit pixels entirely (refinement only searches around the
+        # candidates it finds)
+        if args.max_read_px > 0 and not ds.overviews(1):
+            sys.stderr.write(
+                "Warning: --max-read-px is set but the DEM has no overviews; "
+                "build them with: gdaladdo -r max <dem>\n"
+            )
+
         for rec in iter_jsonl(sys.stdin):
             try:
                 peak_id = rec.get("peak_id")
@@ -397,6 +493,7 @@ def main() -> int:
                 compute_confidence = rec.get("compute_confidence", default_compute_confidence)
                 confidence_radial_m = float(rec.get("confidence_radial_m", args.confidence_radial_m))
                 confidence_neighborhood_m = float(rec.get("confidence_neighborhood_m", args.confidence_neighborhood_m))
+                max_read_px = int(rec.get("max_read_px", args.max_read_px))
 
                 candidates = snap_one_top_k(
                     ds, lon=lon, lat=lat, radius_m=radius_m,
@@ -409,6 +506,7 @@ def main() -> int:
                     compute_confidence=compute_confidence,
                     confidence_radial_m=confidence_radial_m,
                     confidence_neighborhood_m=confidence_neighborhood_m,
+                    max_read_px=max_read_px,
                 )
                 
                 if not candidates:
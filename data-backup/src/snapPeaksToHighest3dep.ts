@@ -171,13 +171,15 @@ const runPythonMLSnap = async (
     scriptPath: string,
     demPath: string,
     modelPath: string,
-    inputs: MLSnapInput[]
+    inputs: MLSnapInput[],
+    workers: number
 ): Promise<MLSnapResult[]> => {
     return await new Promise((resolve, reject) => {
         const child = spawn(pythonBin, [
             scriptPath,
             "--dem-path", demPath,
             "--model-path", modelPath,
+            "--workers", String(workers),
         ], {
             stdio: ["pipe", "pipe", "pipe"],
         });
@@ -309,6 +311,8 @@ export default async function snapPeaksToHighest3dep(): Promise<void> {
     const useMLSnapping = process.env.SNAP_USE_ML === "true";
     const mlScript = process.env.SNAP_ML_SCRIPT ?? "python/ml/predict_summit.py";
     const mlModelPath = process.env.SUMMIT_MODEL_PATH ?? "python/ml/models/summit_model.joblib";
+    // Each worker process opens the DEM and loads the model, once per batch
+    const mlWorkers = Number.parseInt(process.env.SNAP_ML_WORKERS ?? "1", 10);
 
     const state = process.env.SNAP_STATE ?? ""; // empty = no filter
     const country = process.env.SNAP_COUNTRY ?? ""; // empty = no filter
@@ -682,7 +686,7 @@ export default async function snapPeaksToHighest3dep(): Promise<void> {
                 radius_m: inp.radius_m,
             }));
             
-            const mlResults = await runPythonMLSnap(pythonBin, mlScript, demPath, mlModelPath, mlInputs);
+            const mlResults = await runPythonMLSnap(pythonBin, mlScript, demPath, mlModelPath, mlInputs, mlWorkers);
             
             // Convert ML results to SnapResult format
             results = mlResults.map((mr) => {
@@ -732,7 +736,7 @@ export default async function snapPeaksToHighest3dep(): Promise<void> {
                         lon: inp.lon,
                         radius_m: inp.radius_m,
                     }));
-                    const mlFallbackRes = await runPythonMLSnap(pythonBin, mlScript, demPathFallback, mlModelPath, mlFallbackInputs);
+                    const mlFallbackRes = await runPythonMLSnap(pythonBin, mlScript, demPathFallback, mlModelPath, mlFallbackInputs, mlWorkers);
                     fallbackResults = mlFallbackRes.map((mr) => {
                         if (mr.error || mr.snapped_lat === undefined || mr.snapped_lon === undefined) {
                             return { peak_id: mr.peak_id, error: mr.error ?? "ml_failed" };